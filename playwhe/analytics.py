@@ -0,0 +1,234 @@
+import datetime
+import json
+import os
+
+from .constants import MAX_NUMBER, MIN_NUMBER, PERIODS_ABBR
+from .history import History, result_key
+
+
+# The number of marks, i.e. the size of each side of a matrix
+SIZE = MAX_NUMBER - MIN_NUMBER + 1
+
+
+class Analytics:
+    """Mark-to-mark transition and same-day co-occurrence counts.
+
+    transitions[(p, q)][i * SIZE + j] counts how often the number MIN_NUMBER + j
+    was drawn in period q right after the number MIN_NUMBER + i was drawn in
+    period p.
+
+    cooccurrences[i * SIZE + j] counts how often the numbers MIN_NUMBER + i and
+    MIN_NUMBER + j were both drawn on the same day. The counts are symmetric and
+    the diagonal counts the marks that were drawn more than once on a day.
+
+    The counts are built in one pass over a History and can be brought up to
+    date with the results that come after the last one counted.
+    """
+
+    @classmethod
+    def from_history(cls, history):
+        analytics = cls()
+        analytics.count(history.days, history.periods, history.draws, history.numbers)
+
+        return analytics
+
+    @classmethod
+    def from_store(cls, store, path=None):
+        """Returns the analytics for the results in the given Store.
+
+        If path is given then the analytics that are cached there are loaded,
+        updated with the results that were stored since and then cached again.
+        The cache remembers the last seq of the store's change log that it
+        has seen. If a result that comes before the last one counted, e.g. one
+        added by --refetch or --repair, was logged since then the analytics
+        are counted again from scratch.
+        """
+        # Read before the results so that nothing inserted in between is missed
+        seq = store.last_seq()
+        analytics = None
+
+        if path is not None and os.path.exists(path):
+            analytics = cls.load(path)
+
+            if analytics.seq is not None and not analytics.counted_before(store.changes(analytics.seq)):
+                start_date = None
+
+                if analytics.last is not None:
+                    start_date = datetime.date.fromordinal(analytics.last[0])
+
+                analytics.update_from_history(History.from_store(store, start_date))
+            else:
+                analytics = None
+
+        if analytics is None:
+            analytics = cls.from_history(History.from_store(store))
+
+        analytics.seq = seq
+
+        if path is not None:
+            analytics.save(path)
+
+        return analytics
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+
+        analytics = cls()
+        analytics.transitions = {
+            tuple(pair.split()): counts for pair, counts in data['transitions'].items()
+        }
+        analytics.cooccurrences = data['cooccurrences']
+        analytics.last = tuple(data['last']) if data['last'] is not None else None
+        analytics.day_numbers = data['day_numbers']
+        analytics.seq = data.get('seq')
+
+        return analytics
+
+    def __init__(self):
+        self.transitions = {
+            (p, q): [0] * (SIZE * SIZE) for p in PERIODS_ABBR for q in PERIODS_ABBR
+        }
+        self.cooccurrences = [0] * (SIZE * SIZE)
+
+        # The (day, period, draw, number) of the last result counted
+        self.last = None
+
+        # The numbers drawn so far on the day of the last result counted
+        self.day_numbers = []
+
+        # The last seq of the change log that was counted, see from_store
+        self.seq = None
+
+    def count(self, days, periods, draws, numbers):
+        """Counts the results given as parallel sequences that are ordered by day, period and draw."""
+        transitions = {
+            (PERIODS_ABBR.index(p), PERIODS_ABBR.index(q)): counts for (p, q), counts in self.transitions.items()
+        }
+        cooccurrences = self.cooccurrences
+
+        if self.last is None:
+            last_day = last_period = last_index = None
+        else:
+            last_day, last_period, _, last_number = self.last
+            last_period = PERIODS_ABBR.index(last_period)
+            last_index = last_number - MIN_NUMBER
+
+        day_indices = [n - MIN_NUMBER for n in self.day_numbers]
+
+        for day, period, number in zip(days, periods, numbers):
+            index = number - MIN_NUMBER
+
+            if last_index is not None:
+                transitions[(last_period, period)][last_index * SIZE + index] += 1
+
+            if day != last_day:
+                day_indices = []
+
+            for other in day_indices:
+                cooccurrences[other * SIZE + index] += 1
+
+                if other != index:
+                    cooccurrences[index * SIZE + other] += 1
+
+            day_indices.append(index)
+
+            last_day, last_period, last_index = day, period, index
+
+        if len(days):
+            self.last = (days[-1], PERIODS_ABBR[periods[-1]], draws[-1], numbers[-1])
+            self.day_numbers = [i + MIN_NUMBER for i in day_indices]
+
+    def update(self, results):
+        """Counts the given results, ignoring the ones that don't come after the last result counted.
+
+        The results are expected to be in order.
+        """
+        history = History()
+
+        if self.last is not None:
+            day, period, draw, number = self.last
+            history.append_row(draw, day, PERIODS_ABBR.index(period), number)
+
+        appended = history.extend(results)
+
+        if appended:
+            keys = [result_key(r) for r in appended]
+            self.count(
+                [k[0] for k in keys],
+                [k[1] for k in keys],
+                [r.draw for r in appended],
+                [r.number for r in appended]
+            )
+
+        return appended
+
+    def counted_before(self, rows):
+        """Returns whether any of the (draw, date, period_abbr) rows comes at or before the last result counted.
+
+        Such rows can't be counted by update and call for a full count.
+        """
+        if self.last is None:
+            return False
+
+        day, period, draw, _ = self.last
+        last_key = (day, PERIODS_ABBR.index(period), draw)
+
+        return any(
+            (row.date.toordinal(), PERIODS_ABBR.index(row.period_abbr), row.draw) <= last_key
+            for row in rows
+        )
+
+    def update_from_history(self, history):
+        """Counts the results in the history that come after the last result counted."""
+        start = 0
+
+        if self.last is not None:
+            day, period, draw, _ = self.last
+            last_key = (day, PERIODS_ABBR.index(period), draw)
+
+            while start < len(history) and history.key(start) <= last_key:
+                start += 1
+
+        self.count(
+            history.days[start:],
+            history.periods[start:],
+            history.draws[start:],
+            history.numbers[start:]
+        )
+
+    def transition_matrix(self, from_period=None, to_period=None):
+        """Returns the SIZE x SIZE transition counts between the given periods.
+
+        When a period isn't given the counts are summed over all the periods.
+        """
+        totals = [0] * (SIZE * SIZE)
+
+        for (p, q), counts in self.transitions.items():
+            if from_period in (None, p) and to_period in (None, q):
+                totals = [a + b for a, b in zip(totals, counts)]
+
+        return _to_matrix(totals)
+
+    def cooccurrence_matrix(self):
+        """Returns the SIZE x SIZE same-day co-occurrence counts."""
+        return _to_matrix(self.cooccurrences)
+
+    def save(self, path):
+        data = {
+            'transitions': {
+                '{} {}'.format(p, q): counts for (p, q), counts in self.transitions.items()
+            },
+            'cooccurrences': self.cooccurrences,
+            'last': self.last,
+            'day_numbers': self.day_numbers,
+            'seq': self.seq
+        }
+
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+
+def _to_matrix(counts):
+    return [counts[i * SIZE:(i + 1) * SIZE] for i in range(SIZE)]
@@ -0,0 +1,251 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from .analytics import SIZE
+from .constants import MIN_NUMBER, PERIODS_ABBR
+
+
+# The amount that's paid out for each unit staked on a mark that's drawn
+ODDS = 24
+
+
+class Replay:
+    """The state of a replay of a history up to, but excluding, the current draw.
+
+    Strategies are called with a Replay and return the numbers to play on the
+    current draw.
+    """
+
+    def __init__(self, history):
+        self.history = history
+        self.index = 0
+
+        # The index of the last draw of each mark, or -1 if it hasn't been drawn
+        self.last_seen = [-1] * SIZE
+
+        # The number of times each mark has been drawn
+        self.counts = [0] * SIZE
+
+        # The last number drawn in each period
+        self.last_by_period = [None] * len(PERIODS_ABBR)
+
+    @property
+    def day(self):
+        return self.history.days[self.index]
+
+    @property
+    def period(self):
+        return PERIODS_ABBR[self.history.periods[self.index]]
+
+    def gap(self, number):
+        """Returns the number of draws since the given number was last drawn."""
+        return self.index - self.last_seen[number - MIN_NUMBER]
+
+    def advance(self):
+        i = self.index
+        index = self.history.numbers[i] - MIN_NUMBER
+
+        self.last_seen[index] = i
+        self.counts[index] += 1
+        self.last_by_period[self.history.periods[i]] = self.history.numbers[i]
+
+        self.index += 1
+
+
+class PeriodStats:
+    def __init__(self):
+        self.plays = 0
+        self.staked = 0
+        self.hits = 0
+        self.payout = 0
+
+    def hit_rate(self):
+        return self.hits / self.plays if self.plays else 0.0
+
+    def net(self):
+        return self.payout - self.staked
+
+    def __iadd__(self, other):
+        self.plays += other.plays
+        self.staked += other.staked
+        self.hits += other.hits
+        self.payout += other.payout
+
+        return self
+
+    def __repr__(self):
+        return '{}(plays={!r}, staked={!r}, hits={!r}, payout={!r})'.format(self.__class__.__name__, self.plays, self.staked, self.hits, self.payout)
+
+
+class Report:
+    """The hits and payouts of a strategy, per period."""
+
+    def __init__(self, name):
+        self.name = name
+        self.periods = { p: PeriodStats() for p in PERIODS_ABBR }
+
+    def total(self):
+        total = PeriodStats()
+
+        for stats in self.periods.values():
+            total += stats
+
+        return total
+
+    def __repr__(self):
+        return '{}(name={!r}, total={!r})'.format(self.__class__.__name__, self.name, self.total())
+
+
+def backtest(strategy, history, odds=ODDS, stake=1):
+    """Replays the history and returns the Report of playing the strategy on every draw.
+
+    strategy is a callable that takes a Replay and returns the numbers to play,
+    or a rule, see from_rule. Each number played is staked stake units and
+    pays odds units per unit staked when it's drawn.
+    """
+    if isinstance(strategy, dict):
+        strategy = from_rule(strategy)
+
+    report = Report(getattr(strategy, 'name', None) or repr(strategy))
+    replay = Replay(history)
+    numbers = history.numbers
+
+    for i in range(len(history)):
+        picks = strategy(replay)
+
+        if picks:
+            stats = report.periods[replay.period]
+            stats.plays += 1
+            stats.staked += stake * len(picks)
+
+            if numbers[i] in picks:
+                stats.hits += 1
+                stats.payout += stake * odds
+
+        replay.advance()
+
+    return report
+
+
+def backtest_many(strategies, history, workers=None, odds=ODDS, stake=1):
+    """Backtests the strategies in parallel, across up to workers processes.
+
+    The history is sent to each worker once. The strategies must be picklable,
+    i.e. rules or module level callables. Returns the reports in the same order
+    as the strategies.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(history, odds, stake)) as executor:
+        return list(executor.map(_backtest_in_worker, strategies))
+
+
+_worker_args = None
+
+
+def _init_worker(history, odds, stake):
+    global _worker_args
+    _worker_args = (history, odds, stake)
+
+
+def _backtest_in_worker(strategy):
+    history, odds, stake = _worker_args
+
+    return backtest(strategy, history, odds=odds, stake=stake)
+
+
+class Strategy:
+    """A base for strategies that only play in some periods."""
+
+    def __init__(self, periods=None):
+        self.periods = tuple(periods) if periods is not None else PERIODS_ABBR
+
+    def __call__(self, replay):
+        if replay.period in self.periods:
+            return self.pick(replay)
+        else:
+            return ()
+
+    def pick(self, replay):
+        raise NotImplementedError
+
+
+class Numbers(Strategy):
+    """Plays the same numbers every time."""
+
+    def __init__(self, numbers, periods=None):
+        super().__init__(periods)
+        self.numbers = frozenset(numbers)
+
+    def pick(self, replay):
+        return self.numbers
+
+    def __repr__(self):
+        return '{}(numbers={!r}, periods={!r})'.format(self.__class__.__name__, sorted(self.numbers), self.periods)
+
+
+class GapLeaders(Strategy):
+    """Plays the count numbers that have gone the longest without being drawn."""
+
+    def __init__(self, count=1, periods=None):
+        super().__init__(periods)
+        self.count = count
+
+    def pick(self, replay):
+        order = sorted(range(SIZE), key=replay.last_seen.__getitem__)
+
+        return frozenset(MIN_NUMBER + j for j in order[:self.count])
+
+    def __repr__(self):
+        return '{}(count={!r}, periods={!r})'.format(self.__class__.__name__, self.count, self.periods)
+
+
+class HotMarks(Strategy):
+    """Plays the count numbers that have been drawn the most."""
+
+    def __init__(self, count=1, periods=None):
+        super().__init__(periods)
+        self.count = count
+
+    def pick(self, replay):
+        order = sorted(range(SIZE), key=replay.counts.__getitem__, reverse=True)
+
+        return frozenset(MIN_NUMBER + j for j in order[:self.count])
+
+    def __repr__(self):
+        return '{}(count={!r}, periods={!r})'.format(self.__class__.__name__, self.count, self.periods)
+
+
+class RepeatPeriod(Strategy):
+    """Plays the number that was last drawn in the current period."""
+
+    def pick(self, replay):
+        number = replay.last_by_period[PERIODS_ABBR.index(replay.period)]
+
+        return frozenset() if number is None else frozenset([number])
+
+    def __repr__(self):
+        return '{}(periods={!r})'.format(self.__class__.__name__, self.periods)
+
+
+RULES = {
+    'numbers': Numbers,
+    'gap-leaders': GapLeaders,
+    'hot-marks': HotMarks,
+    'repeat-period': RepeatPeriod
+}
+
+
+def from_rule(rule):
+    """Returns the strategy described by the given rule.
+
+    A rule is a dict with a strategy key, one of the keys of RULES, and the
+    keyword arguments of that strategy. For e.g.
+
+        { 'strategy': 'gap-leaders', 'count': 2, 'periods': ['PM'] }
+    """
+    kwargs = dict(rule)
+
+    try:
+        strategy = RULES[kwargs.pop('strategy')]
+    except KeyError:
+        raise ValueError('strategy must be one of {}: rule={!r}'.format(', '.join(RULES), rule))
+
+    return strategy(**kwargs)
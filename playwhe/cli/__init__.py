@@ -1,16 +1,77 @@
 import argparse
+import functools
+import glob
 import logging
 import shlex
+import sys
 
 from sqlalchemy import create_engine
 
+from . import layouts
+from .layouts import ByYear, SingleTable
 from .store import Store
+from .verify import problem_months
+from .. import client
+from ..common import month_range
+from ..games import GAMES, PLAY_WHE, get_game, update_games
+from ..profiling import Profiler
 from ..constants import __version__
+from ..errors import PlayWheError
 
 
 logger = logging.getLogger(__name__)
 
 
+def month_range_type(s):
+    """Parses YYYY-MM or YYYY-MM:YYYY-MM into a list of (year, month) pairs."""
+    try:
+        start, _, end = s.partition(':')
+        start = tuple(map(int, start.split('-')))
+        end = tuple(map(int, end.split('-'))) if end else start
+
+        if len(start) != 2 or len(end) != 2 or not (1 <= start[1] <= 12 and 1 <= end[1] <= 12):
+            raise ValueError
+    except ValueError:
+        raise argparse.ArgumentTypeError('must be YYYY-MM or YYYY-MM:YYYY-MM: {!r}'.format(s))
+
+    return list(month_range(start, end))
+
+
+def draw_range_type(s):
+    """Parses FIRST:LAST or DRAW into a (first, last) pair of draws."""
+    try:
+        first, _, last = s.partition(':')
+        first = int(first)
+        last = int(last) if last else first
+
+        if first < 1 or last < first:
+            raise ValueError
+    except ValueError:
+        raise argparse.ArgumentTypeError('must be FIRST:LAST or DRAW where 1 <= FIRST <= LAST: {!r}'.format(s))
+
+    return first, last
+
+
+def game_type(s):
+    try:
+        return get_game(s)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def csvfiles_type(s):
+    """Expands a path or glob pattern into a list of paths."""
+    if s == '-' or not glob.has_magic(s):
+        return [s]
+
+    paths = sorted(glob.glob(s))
+
+    if not paths:
+        raise argparse.ArgumentTypeError('no files match: {!r}'.format(s))
+
+    return paths
+
+
 PARSER = argparse.ArgumentParser(
     prog='playwhe',
     description='Retrieve and store Play Whe results.'
@@ -24,10 +85,43 @@ PARSER.add_argument('-i', '--init', action='store_true',
 PARSER.add_argument('-u', '--update', action='store_true',
     help='update the database with the latest results'
 )
-PARSER.add_argument('-l', '--load',
-    type=argparse.FileType('r', encoding='utf-8'),
-    metavar='CSV_FILE', dest='csvfile',
-    help='load the database with the results from the given CSV file'
+PARSER.add_argument('-l', '--load', action='append', default=[],
+    type=csvfiles_type,
+    metavar='CSV_FILE', dest='csvfiles',
+    help='load the database with the results from the given CSV file or glob pattern, - for standard input. Can be repeated. Files compressed with gzip, bzip2, xz or zstd are decompressed as they are read'
+)
+PARSER.add_argument('--rejects', metavar='FILE',
+    help='write the lines that fail validation when loading to the given file'
+)
+PARSER.add_argument('-c', '--verify', action='store_true',
+    help='check the stored results for missing, duplicate and out-of-schedule draws'
+)
+PARSER.add_argument('-r', '--refetch', action='append', default=[],
+    type=month_range_type, metavar='YYYY-MM[:YYYY-MM]', dest='months',
+    help='refetch the results for the given month or range of months'
+)
+PARSER.add_argument('-d', '--draws', action='append', default=[],
+    type=draw_range_type, metavar='FIRST[:LAST]',
+    help='refetch the results for the months that contain the given draw or range of draws'
+)
+PARSER.add_argument('--repair', action='store_true',
+    help='refetch the results for the months in which --verify finds problems'
+)
+PARSER.add_argument('-j', '--jobs', type=int, metavar='N',
+    help='the number of things to do concurrently: months to fetch with --refetch, --draws and --repair (default: 1), CSV files to read with --load (default: the number of CPUs), or games to update with several --game options (default: the number of games)'
+)
+PARSER.add_argument('--page-cache', metavar='FILE',
+    help='remember the pages fetched when updating in the given file, so that pages that haven\'t changed since the last update are skipped'
+)
+PARSER.add_argument('--profile', metavar='FILE',
+    help='profile the run, write the cProfile stats to the given file and print the time spent in each stage, and the top hot spots, to standard error'
+)
+PARSER.add_argument('-g', '--game', action='append', default=[],
+    type=game_type, metavar='GAME', dest='games',
+    help='the game to work with, one of: {}. Can be repeated to initialize or update several games at once, each in its own tables (default: playwhe)'.format(', '.join(sorted(GAMES)))
+)
+PARSER.add_argument('--partitioned', action='store_true',
+    help='store the results of each year in its own table, so that queries over a range of dates only read the years in the range. Databases that were initialized with it are detected and keep using it without the option'
 )
 PARSER.add_argument('-V', '--verbose', action='store_true',
     help='verbose output'
@@ -76,21 +170,123 @@ class CLI:
         logger.addHandler(handler)
 
     def configure_storage(self):
-        self.store = Store(create_engine(self.namespace.database_url))
+        self.games = self.namespace.games or [PLAY_WHE]
+        self.game = self.games[0]
+
+        bind = create_engine(self.namespace.database_url)
+        detected = layouts.detect(bind) if self.game is PLAY_WHE else None
+
+        if self.namespace.partitioned:
+            if self.games != [PLAY_WHE]:
+                PARSER.error('--partitioned only works with the playwhe game')
+
+            if type(detected) is SingleTable:
+                PARSER.error('--partitioned can\'t be used with a database whose results are already stored unpartitioned')
+
+            layout = ByYear()
+        elif isinstance(detected, ByYear):
+            logger.info('The results are stored partitioned, using --partitioned')
+            layout = detected
+        else:
+            layout = self.game.layout()
+
+        self.store = Store(bind, layout=layout)
 
     def run(self):
+        if self.namespace.profile is None:
+            self.run_tasks()
+        else:
+            with Profiler(self.namespace.profile) as profiler:
+                self.run_tasks()
+
+            print(profiler.summary(), file=sys.stderr)
+
+    def run_tasks(self):
         force_update = True
 
         if self.namespace.init:
             force_update = False
+
+            for game in self.games[1:]:
+                Store(self.store.bind, layout=game.layout()).initialize()
+
             self.store.initialize()
 
-        if self.namespace.csvfile:
+        if self.namespace.csvfiles:
+            force_update = False
+            self.load()
+
+        if self.namespace.months or self.namespace.draws:
+            force_update = False
+            self.refetch()
+
+        if self.namespace.verify:
             force_update = False
-            self.store.load(self.namespace.csvfile)
 
         if self.namespace.update or force_update:
-            self.store.update()
+            self.update()
+
+        if self.namespace.verify:
+            months = self.verify()
+
+            if self.namespace.repair and months:
+                self.store.refetch(months, fetch=self.game.fetch, workers=self.namespace.jobs or 1)
+
+    def update(self):
+        if len(self.games) > 1:
+            errors = update_games(self.store.bind, self.games, workers=self.namespace.jobs)
+
+            if errors:
+                raise PlayWheError('the update of some games failed: {}'.format(', '.join(sorted(errors))))
+        elif self.namespace.page_cache is None:
+            self.store.update(fetch=self.game.fetch, start_date=self.game.start_date)
+        else:
+            cache = client.PageCache(self.namespace.page_cache)
+            self.store.update(
+                fetch=functools.partial(self.game.fetch, cache=cache),
+                start_date=self.game.start_date,
+                on_commit=functools.partial(client.record_page, cache)
+            )
+
+    def load(self):
+        paths = [path for paths in self.namespace.csvfiles for path in paths]
+
+        if paths == ['-']:
+            self.store.load(sys.stdin.buffer, rejects=self.namespace.rejects)
+        else:
+            self.store.load_files(paths, workers=self.namespace.jobs, rejects=self.namespace.rejects)
+
+    def refetch(self):
+        months = set()
+
+        for m in self.namespace.months:
+            months.update(m)
+
+        for first, last in self.namespace.draws:
+            months.update(self.store.draw_months(first, last))
+
+        self.store.refetch(months, fetch=self.game.fetch, workers=self.namespace.jobs or 1)
+
+    def verify(self):
+        logger.info('Verification started...')
+
+        total = 0
+        months = set()
+
+        for problem in self.store.verify(periods_on=self.game.periods_on):
+            print('{}: {}'.format(problem.kind, problem.message))
+
+            total += 1
+            months.update(problem_months(problem))
+
+        print('Total problems = {}'.format(total))
+
+        if months:
+            print('Months to refetch: {}'.format(' '.join('{}-{:02d}'.format(year, month) for year, month in sorted(months))))
+
+        logger.info('Verification done!')
+
+        return months
 
 
 def main(args=None):
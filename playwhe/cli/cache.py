@@ -0,0 +1,118 @@
+import threading
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A size-bounded mapping that evicts the least recently used entry when it's full.
+
+    hits, misses and evictions count how the cache has been used. It's safe to
+    use from multiple threads.
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError('maxsize must be a positive integer: {!r}'.format(maxsize))
+
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Bumped by clear so that values computed before it aren't cached after it
+        self.generation = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, compute):
+        """Returns the value cached for key, calling compute to get it, and caching it, when it isn't cached."""
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                generation = self.generation
+            else:
+                self.hits += 1
+                self.entries.move_to_end(key)
+
+                return value
+
+        value = compute()
+
+        with self.lock:
+            if generation != self.generation:
+                return value
+
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.generation += 1
+
+    def stats(self):
+        return { 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self.entries) }
+
+    def __repr__(self):
+        return '{}(maxsize={!r}, hits={!r}, misses={!r})'.format(self.__class__.__name__, self.maxsize, self.hits, self.misses)
+
+
+class CachedStore:
+    """Answers the read queries of a Store from an LRUCache.
+
+    The cache is cleared whenever the store inserts new results, see
+    Store.subscribe. Results inserted by other processes aren't noticed, so
+    call invalidate, or tail Store.changes, when the database is shared.
+    """
+
+    def __init__(self, store, maxsize=128):
+        self.store = store
+        self.cache = LRUCache(maxsize)
+
+        store.subscribe(self.invalidate)
+
+    def close(self):
+        """Stops listening for inserts."""
+        self.store.unsubscribe(self.invalidate)
+
+    def invalidate(self, results=None):
+        self.cache.clear()
+
+    def last_result(self):
+        return self.cache.get(('last_result',), self.store.last_result)
+
+    def results(self, start_date=None, end_date=None):
+        return self.cache.get(
+            ('results', start_date, end_date),
+            lambda: list(self.store.results(start_date, end_date))
+        )
+
+    def last_appearances(self, number, n, period=None):
+        return self.cache.get(
+            ('last_appearances', number, n, period),
+            lambda: self.store.last_appearances(number, n, period)
+        )
+
+    def daily_counts(self, start_date, end_date, period=None):
+        return self.cache.get(
+            ('daily_counts', start_date, end_date, period),
+            lambda: self.store.daily_counts(start_date, end_date, period)
+        )
+
+    def monthly_counts(self, start, end, period=None):
+        return self.cache.get(
+            ('monthly_counts', tuple(start), tuple(end), period),
+            lambda: self.store.monthly_counts(start, end, period)
+        )
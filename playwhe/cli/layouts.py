@@ -0,0 +1,212 @@
+import datetime
+import re
+
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy import Date, Integer, String
+from sqlalchemy import ForeignKey
+from sqlalchemy import exists, inspect, select
+
+from . import schema
+
+
+class SingleTable:
+    """Stores all the results in the results table."""
+
+    # The tables that the counts and the change log are kept in
+    daily_counts = schema.daily_counts
+    monthly_counts = schema.monthly_counts
+    changes = schema.changes
+    checkpoints = schema.checkpoints
+
+    def create(self, conn):
+        """Creates the tables that schema.metadata doesn't, if any."""
+        pass
+
+    def tables(self, conn, start_date=None, end_date=None):
+        """Returns, in date order, the tables that may hold results from start_date to end_date."""
+        return [schema.results]
+
+    def table_for(self, conn, year):
+        """Returns the table that holds the results of the given year."""
+        return schema.results
+
+    def bounds(self, table):
+        """Returns the (start_date, end_date) that the dates of the results in the table are within.
+
+        None means unbounded.
+        """
+        return None, None
+
+    def __repr__(self):
+        return '{}()'.format(self.__class__.__name__)
+
+
+# The per-year tables are kept apart from schema.metadata so that
+# metadata.create_all only ever creates the tables that are always needed
+partition_metadata = MetaData()
+
+
+PARTITION_NAME_RE = re.compile(r'^results_(\d{4})$')
+
+
+# The value of the layout setting of a database whose results are partitioned
+BY_YEAR = 'by_year'
+
+
+class ByYear(SingleTable):
+    """Stores the results of each year in its own results_<year> table.
+
+    Queries over a date range only touch the tables of the years in the range.
+    The tables are created the first time a result for their year is inserted.
+    """
+
+    def __init__(self):
+        self.years = None
+
+    def create(self, conn):
+        """Records in the settings table that the results are partitioned, see detect."""
+        conn.execute(schema.settings.insert().prefix_with('OR REPLACE'), { 'name': 'layout', 'value': BY_YEAR })
+
+    def _known_years(self, conn):
+        if self.years is None:
+            self.years = set()
+
+            for name in inspect(conn).get_table_names():
+                match = PARTITION_NAME_RE.match(name)
+
+                if match:
+                    self.years.add(int(match.group(1)))
+
+        return self.years
+
+    def tables(self, conn, start_date=None, end_date=None):
+        years = sorted(self._known_years(conn))
+
+        return [
+            partition(year) for year in years
+            if (start_date is None or year >= start_date.year) and (end_date is None or year <= end_date.year)
+        ]
+
+    def table_for(self, conn, year):
+        years = self._known_years(conn)
+        table = partition(year)
+
+        if year not in years:
+            table.create(conn, checkfirst=True)
+            years.add(year)
+
+        return table
+
+    def bounds(self, table):
+        year = int(PARTITION_NAME_RE.match(table.name).group(1))
+
+        return datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+
+
+def detect(bind):
+    """Returns the layout that the results in the database are stored in.
+
+    That's ByYear if the database was initialized with it, or has
+    results_<year> tables, SingleTable if there are results in the results
+    table, or None if nothing is known yet. Only Play Whe's tables are looked
+    at.
+    """
+    names = inspect(bind).get_table_names()
+
+    if schema.settings.name in names:
+        value = bind.execute(select([schema.settings.c.value]).where(schema.settings.c.name == 'layout')).scalar()
+
+        if value == BY_YEAR:
+            return ByYear()
+
+    if any(PARTITION_NAME_RE.match(name) for name in names):
+        return ByYear()
+
+    if schema.results.name in names and bind.execute(select([exists().select_from(schema.results)])).scalar():
+        return SingleTable()
+
+    return None
+
+
+def partition(year):
+    """Returns the results_<year> table."""
+    name = 'results_{}'.format(year)
+
+    try:
+        return partition_metadata.tables[name]
+    except KeyError:
+        return Table(name, partition_metadata,
+            Column('draw', Integer, primary_key=True, autoincrement=False),
+            Column('date', Date, nullable=False, index=True),
+            Column('period_abbr', None, ForeignKey(schema.periods.c.abbr), nullable=False),
+            Column('mark_number', None, ForeignKey(schema.marks.c.number), nullable=False)
+        )
+
+
+class GameTables(SingleTable):
+    """Stores the results, counts and change log of a game other than Play Whe in its own tables.
+
+    The tables are named after the game, for e.g. cashpot_results, and have no
+    foreign keys since the marks and periods tables only describe Play Whe.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+        self.results, self.daily_counts, self.monthly_counts, self.changes, self.checkpoints = game_tables(name)
+
+    def create(self, conn):
+        for table in (self.results, self.daily_counts, self.monthly_counts, self.changes, self.checkpoints):
+            table.create(conn, checkfirst=True)
+
+    def tables(self, conn, start_date=None, end_date=None):
+        return [self.results]
+
+    def table_for(self, conn, year):
+        return self.results
+
+    def __repr__(self):
+        return '{}(name={!r})'.format(self.__class__.__name__, self.name)
+
+
+def game_tables(name):
+    """Returns the <name>_results, <name>_daily_counts, <name>_monthly_counts, <name>_changes and <name>_checkpoints tables."""
+    names = [name + suffix for suffix in ('_results', '_daily_counts', '_monthly_counts', '_changes', '_checkpoints')]
+
+    if names[0] in partition_metadata.tables:
+        return [partition_metadata.tables[n] for n in names]
+
+    return [
+        Table(names[0], partition_metadata,
+            Column('draw', Integer, primary_key=True, autoincrement=False),
+            Column('date', Date, nullable=False, index=True),
+            Column('period_abbr', String(2), nullable=False),
+            Column('mark_number', Integer, nullable=False)
+        ),
+        Table(names[1], partition_metadata,
+            Column('date', Date, primary_key=True),
+            Column('period_abbr', String(2), primary_key=True),
+            Column('mark_number', Integer, primary_key=True, autoincrement=False),
+            Column('count', Integer, nullable=False)
+        ),
+        Table(names[2], partition_metadata,
+            Column('year', Integer, primary_key=True, autoincrement=False),
+            Column('month', Integer, primary_key=True, autoincrement=False),
+            Column('period_abbr', String(2), primary_key=True),
+            Column('mark_number', Integer, primary_key=True, autoincrement=False),
+            Column('count', Integer, nullable=False)
+        ),
+        Table(names[3], partition_metadata,
+            Column('seq', Integer, primary_key=True),
+            Column('draw', Integer, nullable=False),
+            Column('date', Date, nullable=False),
+            Column('period_abbr', String(2), nullable=False),
+            Column('mark_number', Integer, nullable=False),
+            sqlite_autoincrement=True
+        ),
+        Table(names[4], partition_metadata,
+            Column('year', Integer, primary_key=True, autoincrement=False),
+            Column('month', Integer, primary_key=True, autoincrement=False),
+            Column('draws', Integer, nullable=False)
+        )
+    ]
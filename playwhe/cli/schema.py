@@ -23,3 +23,48 @@ results = Table('results', metadata,
     Column('period_abbr', None, ForeignKey('periods.abbr'), nullable=False),
     Column('mark_number', None, ForeignKey('marks.number'), nullable=False)
 )
+
+# The number of times each mark was drawn in each period of each day. It's
+# maintained alongside the results table, see playwhe.cli.store.insert.
+daily_counts = Table('daily_counts', metadata,
+    Column('date', Date, primary_key=True),
+    Column('period_abbr', None, ForeignKey('periods.abbr'), primary_key=True),
+    Column('mark_number', None, ForeignKey('marks.number'), primary_key=True),
+    Column('count', Integer, nullable=False)
+)
+
+# The number of times each mark was drawn in each period of each month
+monthly_counts = Table('monthly_counts', metadata,
+    Column('year', Integer, primary_key=True, autoincrement=False),
+    Column('month', Integer, primary_key=True, autoincrement=False),
+    Column('period_abbr', None, ForeignKey('periods.abbr'), primary_key=True),
+    Column('mark_number', None, ForeignKey('marks.number'), primary_key=True),
+    Column('count', Integer, nullable=False)
+)
+
+# An append-only log of the results in the order in which they were inserted.
+# seq increases monotonically and is never reused, so consumers can tail the
+# log by asking for the changes since the last seq they've seen.
+changes = Table('changes', metadata,
+    Column('seq', Integer, primary_key=True),
+    Column('draw', Integer, nullable=False),
+    Column('date', Date, nullable=False),
+    Column('period_abbr', String(2), nullable=False),
+    Column('mark_number', Integer, nullable=False),
+    sqlite_autoincrement=True
+)
+
+# The months that Store.update has fetched in full, so that an interrupted
+# update doesn't fetch them again when it's resumed
+checkpoints = Table('checkpoints', metadata,
+    Column('year', Integer, primary_key=True, autoincrement=False),
+    Column('month', Integer, primary_key=True, autoincrement=False),
+    Column('draws', Integer, nullable=False)
+)
+
+# Facts about how the database is set up, for e.g. the layout its results are
+# stored in, as name/value pairs
+settings = Table('settings', metadata,
+    Column('name', String(32), primary_key=True),
+    Column('value', String(32), nullable=False)
+)
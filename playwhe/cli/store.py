@@ -1,23 +1,71 @@
+import calendar
+import datetime
+import heapq
+import inspect
 import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
 
-from sqlalchemy import case, create_engine, select
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from operator import attrgetter
+
+from sqlalchemy import and_, case, create_engine, func, select, true
+from sqlalchemy.engine import Connection
 
 from . import schema
+from .layouts import SingleTable
+from .verify import verify
 from .. import client
-from ..common import Results, date_range
-from ..constants import MARKS, PERIODS
+from ..common import ErrorReport, Results, date_range, month_range, open_csvfile
+from ..constants import MARKS, PERIODS, START_DATE
+from ..profiling import span
 
 
 logger = logging.getLogger(__name__)
 
 
+# A stored row and a fetched result that have the same draw but disagree on
+# its date, period or number
+Conflict = namedtuple('Conflict', ['stored', 'fetched'])
+
+
 class Store:
-    def __init__(self, bind=None):
+    def __init__(self, bind=None, layout=None):
         if bind is None:
             self.bind = create_engine('sqlite:///:memory:')
         else:
             self.bind = bind
 
+        # How the results are laid out in tables, see playwhe.cli.layouts
+        self.layout = SingleTable() if layout is None else layout
+
+        self.subscribers = []
+
+        # The conflicts found by update and refetch, see insert
+        self.conflicts = []
+
+    def subscribe(self, callback):
+        """Registers a callback that is called with the newly inserted results of every insert once it's committed.
+
+        Results that were already stored aren't passed along. Consumers in
+        other processes can tail the change log instead, see changes.
+        """
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        self.subscribers.remove(callback)
+
+    def publish(self, results):
+        if results:
+            for callback in list(self.subscribers):
+                callback(results)
+
     def initialize(self):
         """Creates all the tables and then seeds the ones that need to be prepopulated.
 
@@ -28,6 +76,7 @@ class Store:
         with self.bind.begin() as conn:
             logger.info('Creating the tables...')
             schema.metadata.create_all(conn)
+            self.layout.create(conn)
 
             logger.info('Seeding the marks table...')
             conn.execute(
@@ -41,44 +90,190 @@ class Store:
                 [{ 'abbr': p.abbr, 'label': p.label, 'time_of_day': p.time_of_day } for p in PERIODS.values()]
             )
 
+            logger.info('Rebuilding the daily and monthly counts...')
+            for table in self.layout.tables(conn):
+                refresh_counts(conn, *self.layout.bounds(table), source=table, layout=self.layout)
+
         logger.info('Initialization done!')
 
-    def load(self, csvfile):
-        """Inserts results from the given CSV file."""
+    def load(self, csvfile, rejects=None):
+        """Inserts results from the given CSV file.
+
+        csvfile may be a path, a binary file or a text file. Compressed files are
+        decompressed as they are read, see :func:`playwhe.common.open_csvfile`.
+
+        The lines that fail validation are written to the file at the path
+        rejects, if given, as they're read.
+        """
         logger.info('Loading started...')
 
         logger.info('Reading the results from the CSV file...')
-        results = Results.from_csvfile(csvfile)
+        with span('read'), open_csvfile(csvfile) as f, open_rejects(rejects) as reject_file:
+            results = Results.from_csvfile(f, error_report=ErrorReport(reject_file=reject_file))
 
         logger.info('Inserting the results...')
-        insert(self.bind, results)
+        self.publish(insert(self.bind, results, self.layout))
 
         logger.info('Loading done!')
 
-    def update(self, fetch=client.fetch, today=None):
-        """Updates results with the latest from the server."""
+    def load_files(self, paths, workers=None, batch_size=10000, rejects=None):
+        """Inserts results from the CSV files at the given paths.
+
+        The files are read and validated by a pool of up to workers processes.
+        Their results are then merged in draw order and inserted by a single
+        writer in batches of batch_size. The path - is read from standard input
+        by the current process.
+
+        The lines that fail validation are written to the file at the path
+        rejects, if given, in the order of the paths.
+        """
+        logger.info('Loading started...')
+
+        stdin = [path for path in paths if path == '-']
+        paths = [path for path in paths if path != '-']
+
+        logger.info('Reading the results from {} CSV file(s)...'.format(len(paths) + len(stdin)))
+
+        read = partial(read_csvfile, rejects=rejects is not None)
+
+        if len(paths) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                loaded = list(executor.map(read, paths))
+        else:
+            loaded = list(map(read, paths))
+
+        if stdin:
+            loaded.append(read(sys.stdin.buffer))
+
+        error_report = ErrorReport()
+
+        for path, results, seconds, _ in loaded:
+            rows = len(results) + results.error_report.total
+            logger.info('Read {} rows from {} in {:.3f}s ({:.0f} rows/sec)'.format(
+                rows, path, seconds, rows / seconds if seconds else 0
+            ))
+
+            # Only the samples of the combined report are kept
+            error_report.update(results.error_report)
+            results.error_report.samples.clear()
+
+        if error_report.total:
+            logger.error(error_report.full_error_messages())
+
+        if rejects is not None:
+            with open(rejects, 'wb') as f:
+                for _, _, _, reject_path in loaded:
+                    with open(reject_path, 'rb') as reject_file:
+                        shutil.copyfileobj(reject_file, f)
+
+                    os.remove(reject_path)
+
+        logger.info('Inserting the results...')
+
+        merged = heapq.merge(*(results for _, results, _, _ in loaded), key=attrgetter('draw'))
+
+        batches = []
+
+        with self.bind.begin() as conn:
+            batch = []
+
+            for result in merged:
+                batch.append(result)
+
+                if len(batch) == batch_size:
+                    batches.append(insert(conn, Results(batch), self.layout))
+                    batch = []
+
+            batches.append(insert(conn, Results(batch), self.layout))
+
+        for batch in batches:
+            self.publish(batch)
+
+        logger.info('Loading done!')
+
+    def update(self, fetch=client.fetch, today=None, start_date=None, on_commit=None):
+        """Updates results with the latest from the server.
+
+        fetch is called with the year and month to fetch. For the month of the
+        last stored result, fetch functions that accept it are also called with
+        after, the last stored draw, so that only the newer results need to be
+        parsed. When there are no
+        stored results the update starts from start_date, which defaults to
+        Play Whe's START_DATE.
+
+        Each month is inserted in its own transaction. A month that is over by
+        today, whose page had only valid results and whose stored draws run
+        without a gap up to the first draw of the next month, is checkpointed
+        in the transaction of the month after it. Checkpointed months aren't
+        fetched again by later updates, so an interrupted update resumes from
+        the last month it finished. Since the draws are numbered in order,
+        holidays don't stop a month from being checkpointed while a cut off or
+        partly published page does.
+
+        on_commit, when given, is called with the year, month and results of
+        each month once its transaction has committed.
+        """
         kwargs = {}
+        after = None
 
-        if today is not None:
-            kwargs['today'] = today
+        if today is None:
+            today = datetime.date.today
+
+        kwargs['today'] = today
+
+        if start_date is not None:
+            kwargs['start_date'] = start_date
 
         with self.bind.connect() as conn:
-            last_result = conn.execute(select_last_result()).fetchone()
+            last_result = self.last_result(conn)
 
             if last_result is not None:
                 kwargs['start_date'] = last_result.date
                 kwargs['period'] = last_result.period_abbr
+                after = last_result.draw
+
+            checkpoints = self.checkpoints(conn)
+
+            # The last month that's over and whose page had only valid results
+            pending = None
 
             try:
-                if last_result is None:
+                if last_result is None and not checkpoints:
                     logger.info('Update started...')
                 else:
                     logger.info('Update resumed...')
 
                 for year, month in date_range(**kwargs):
+                    if (year, month) in checkpoints:
+                        logger.info('Skipping year={}, month={}, it was already updated'.format(year, month))
+                        continue
+
                     logger.info('Updating year={}, month={}...'.format(year, month))
 
-                    insert(conn, fetch(year, month))
+                    if after is None or not accepts_after(fetch):
+                        results = fetch(year, month)
+                    else:
+                        results = fetch(year, month, after=after)
+
+                    after = None
+
+                    with conn.begin():
+                        inserted = insert(conn, results, self.layout, conflicts=self.conflicts)
+
+                        # Months with missing or invalid results are fetched again next time
+                        if pending is not None:
+                            draws = complete_draws(conn, self.layout, *pending)
+
+                            if draws is not None:
+                                checkpoint(conn, pending[0], pending[1], draws, self.layout)
+
+                        last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
+                        pending = (year, month) if results.all_valid() and last_day < today() else None
+
+                    self.publish(inserted)
+
+                    if on_commit is not None:
+                        on_commit(year, month, results)
 
                     logger.info('Update for year={}, month={} done!'.format(year, month))
             except KeyboardInterrupt:
@@ -86,17 +281,455 @@ class Store:
             else:
                 logger.info('Update done!')
 
+    def refetch(self, months, fetch=client.fetch, workers=1):
+        """Refetches the results for the given (year, month) pairs.
+
+        Up to workers months are fetched concurrently but their results are
+        inserted one month at a time, in order. Results that are already stored
+        are left untouched.
+        """
+        months = sorted(set(months))
+
+        logger.info('Refetch started...')
+
+        with ThreadPoolExecutor(max_workers=workers) as executor, self.bind.connect() as conn:
+            try:
+                for (year, month), results in zip(months, executor.map(lambda m: fetch(*m), months)):
+                    logger.info('Refetching year={}, month={}...'.format(year, month))
+
+                    self.publish(insert(conn, results, self.layout, conflicts=self.conflicts))
+
+                    logger.info('Refetch for year={}, month={} done!'.format(year, month))
+            except KeyboardInterrupt:
+                logger.info('Refetch stopped!')
+            else:
+                logger.info('Refetch done!')
+
+    def draw_months(self, first, last, today=datetime.date.today):
+        """Returns the (year, month) pairs that could contain the draws from first to last inclusive.
+
+        The months are bounded by the closest stored draws on either side of the
+        range. When there are no such draws the range is bounded by the start of
+        Play Whe and today.
+        """
+        with self.bind.connect() as conn:
+            tables = self.layout.tables(conn)
+
+            start_dates = [conn.execute(select_draw_date(func.max, t.c.draw <= first, t)).scalar() for t in tables]
+            end_dates = [conn.execute(select_draw_date(func.min, t.c.draw >= last, t)).scalar() for t in tables]
+
+        start_date = max(filter(None, start_dates), default=START_DATE)
+        end_date = min(filter(None, end_dates), default=None) or today()
+
+        return list(month_range((start_date.year, start_date.month), (end_date.year, end_date.month)))
+
+    def last_result(self, conn=None):
+        """Returns the last stored result, or None if there are no results.
+
+        Only the latest table that has results is queried.
+        """
+        if conn is None:
+            with self.bind.connect() as conn:
+                return self.last_result(conn)
+
+        for table in reversed(self.layout.tables(conn)):
+            last_result = conn.execute(select_last_result(table)).fetchone()
+
+            if last_result is not None:
+                return last_result
+
+        return None
+
+    def results(self, start_date=None, end_date=None):
+        """Yields the stored results from start_date to end_date inclusive, ordered by date, period and draw.
+
+        Only the tables that can hold results in the date range are queried.
+        """
+        with self.bind.connect() as conn:
+            for table in self.layout.tables(conn, start_date, end_date):
+                yield from conn.execute(select_results(start_date, end_date, table))
+
+    def last_appearances(self, number, n, period=None):
+        """Returns the last n stored results in which the given number was drawn, latest first.
+
+        When a period is given only the results of that period are considered.
+        """
+        appearances = []
+
+        with self.bind.connect() as conn:
+            for table in reversed(self.layout.tables(conn)):
+                if len(appearances) >= n:
+                    break
+
+                appearances.extend(conn.execute(select_appearances(number, n - len(appearances), period, table)))
+
+        return appearances
+
+    def checkpoints(self, conn=None):
+        """Returns the set of (year, month) pairs that have been checkpointed by update."""
+        bind = self.bind if conn is None else conn
+        table = self.layout.checkpoints
+
+        return set(tuple(row) for row in bind.execute(select([table.c.year, table.c.month])))
+
+    def changes(self, since=0, limit=None):
+        """Returns the (seq, draw, date, period_abbr, mark_number) rows of the change log with a seq greater than since.
+
+        The rows are ordered by seq. Pass the seq of the last row seen as since
+        to get only the results that were inserted after it.
+        """
+        return self.bind.execute(select_changes(since, limit, self.layout.changes)).fetchall()
+
+    def last_seq(self):
+        """Returns the seq of the last change, or 0 if there are none."""
+        return self.bind.execute(select([func.max(self.layout.changes.c.seq)])).scalar() or 0
+
+    def daily_counts(self, start_date, end_date, period=None):
+        """Returns the (date, period_abbr, mark_number, count) rows from start_date to end_date inclusive."""
+        return self.bind.execute(select_daily_counts(start_date, end_date, period, self.layout.daily_counts)).fetchall()
+
+    def monthly_counts(self, start, end, period=None):
+        """Returns the (year, month, period_abbr, mark_number, count) rows for the (year, month) pairs from start to end inclusive."""
+        return self.bind.execute(select_monthly_counts(start, end, period, self.layout.monthly_counts)).fetchall()
+
+    def verify(self, today=None, periods_on=None):
+        """Yields the problems found in the stored results.
+
+        See :func:`playwhe.cli.verify.verify` for the problems that are checked.
+        """
+        kwargs = {}
+
+        if today is not None:
+            kwargs['today'] = today
+
+        if periods_on is not None:
+            kwargs['periods_on'] = periods_on
+
+        with self.bind.connect() as conn:
+            yield from verify(conn, tables=self.layout.tables(conn), **kwargs)
+
+
+def accepts_after(fetch):
+    """Returns whether the fetch function can be called with an after keyword argument."""
+    try:
+        parameters = inspect.signature(fetch).parameters.values()
+    except (TypeError, ValueError):
+        return False
+
+    return any(p.name == 'after' or p.kind == p.VAR_KEYWORD for p in parameters)
+
+
+def read_csvfile(path, rejects=False):
+    """Returns the path, the results sorted by draw and the seconds it took to read the given CSV file.
+
+    path may also be an open file, in which case its name is returned as the path.
+
+    When rejects is true the lines that fail validation are written to a
+    temporary file whose path is returned last, otherwise None is.
+    """
+    start = time.perf_counter()
+    reject_path = None
+
+    with span('read'), open_csvfile(path) as csvfile, ExitStack() as stack:
+        if rejects:
+            reject_file = stack.enter_context(tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False))
+            reject_path = reject_file.name
+        else:
+            reject_file = None
+
+        results = Results.from_csvfile(csvfile, error_report=ErrorReport(reject_file=reject_file))
+
+    if not isinstance(path, str):
+        path = getattr(path, 'name', repr(path))
+
+    results.sort(key=attrgetter('draw'))
+
+    return path, results, time.perf_counter() - start, reject_path
+
+
+@contextmanager
+def open_rejects(path):
+    """Yields the file at path opened for writing rejected lines, or None if path is None."""
+    if path is None:
+        yield None
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            yield f
+
+
+def insert(bind, results, layout=None, stored=None, conflicts=None):
+    """Inserts the valid results, ignoring the ones that are already stored.
+
+    The results are routed to the tables of the given layout, SingleTable by
+    default, and merged in draw order with the rows that are already stored,
+    see merge. stored, when given, are those rows sorted by draw, otherwise
+    the rows with draws in the range of the results are read from every
+    table. Only the new results are sent to the database. They're appended to
+    the change log and the daily and monthly counts of their months are
+    refreshed, all in the same transaction.
+
+    Stored rows that disagree with the results are logged and, when conflicts
+    is a list, appended to it as Conflicts. The stored rows are kept, even the
+    ones that weren't in stored, e.g. because another writer inserted them.
+
+    Returns the newly inserted results.
+    """
+    inserted = Results([])
 
-def insert(bind, results):
     if results:
-        bind.execute(
-            schema.results.insert().prefix_with('OR IGNORE'),
-            [{ 'draw': r.draw, 'date': r.date, 'period_abbr': r.period, 'mark_number': r.number } for r in results]
-        )
+        layout = SingleTable() if layout is None else layout
+
+        with span('insert'), transaction(bind) as conn:
+            if stored is None:
+                stored = stored_rows(conn, layout.tables(conn), min(r.draw for r in results), max(r.draw for r in results))
+
+            by_table = {}
+
+            for r in results:
+                by_table.setdefault(layout.table_for(conn, r.date.year), []).append(r)
+
+            for table, rs in by_table.items():
+                rs.sort(key=attrgetter('draw'))
+                rs, table_conflicts = merge(stored, rs)
+
+                if rs:
+                    rows = [{ 'draw': r.draw, 'date': r.date, 'period_abbr': r.period, 'mark_number': r.number } for r in rs]
+
+                    # Rows that were stored after stored was read are ignored. The
+                    # ones that disagree with the results are reported as conflicts.
+                    if conn.execute(table.insert().prefix_with('OR IGNORE'), rows).rowcount != len(rows):
+                        actual = { row.draw: row for row in stored_rows(conn, [table], rs[0].draw, rs[-1].draw) }
+                        kept = []
+
+                        for r in rs:
+                            row = actual[r.draw]
+
+                            if (row.date, row.period_abbr, row.mark_number) == (r.date, r.period, r.number):
+                                kept.append(r)
+                            else:
+                                table_conflicts.append(Conflict(row, r))
+
+                        rs = kept
+                        rows = [{ 'draw': r.draw, 'date': r.date, 'period_abbr': r.period, 'mark_number': r.number } for r in rs]
+
+                for conflict in table_conflicts:
+                    logger.warning('Draw {} is stored as {} {} {} but was fetched as {} {} {}'.format(
+                        conflict.fetched.draw,
+                        conflict.stored.date, conflict.stored.period_abbr, conflict.stored.mark_number,
+                        conflict.fetched.date, conflict.fetched.period, conflict.fetched.number
+                    ))
+
+                if conflicts is not None:
+                    conflicts.extend(table_conflicts)
+
+                if not rs:
+                    continue
+
+                conn.execute(layout.changes.insert(), rows)
+                inserted.extend(rs)
+
+                start_date = min(r.date for r in rs)
+                end_date = max(r.date for r in rs)
+
+                refresh_counts(conn,
+                    datetime.date(start_date.year, start_date.month, 1),
+                    datetime.date(end_date.year, end_date.month, calendar.monthrange(end_date.year, end_date.month)[1]),
+                    source=table,
+                    layout=layout
+                )
 
     if not results.all_valid():
         logger.error(results.full_error_messages())
 
+    return inserted
+
+
+def stored_rows(conn, tables, first, last):
+    """Returns the (draw, date, period_abbr, mark_number) rows of the tables with draws from first to last inclusive, sorted by draw."""
+    rows = []
+
+    for table in tables:
+        rows.extend(conn.execute(
+            select([table.c.draw, table.c.date, table.c.period_abbr, table.c.mark_number]).
+                where(table.c.draw.between(first, last)).
+                order_by(table.c.draw)
+        ))
+
+    rows.sort(key=attrgetter('draw'))
+
+    return rows
+
+
+def merge(stored, results):
+    """Merges the results with the stored rows, both sorted by draw.
+
+    Returns the results whose draws aren't stored, keeping the first of any
+    results with the same draw, and the Conflicts between the stored rows and
+    the results with the same draws.
+    """
+    new = []
+    conflicts = []
+
+    i = 0
+    last_draw = None
+
+    for result in results:
+        if result.draw == last_draw:
+            continue
+
+        last_draw = result.draw
+
+        while i < len(stored) and stored[i].draw < result.draw:
+            i += 1
+
+        if i < len(stored) and stored[i].draw == result.draw:
+            row = stored[i]
+
+            if (row.date, row.period_abbr, row.mark_number) != (result.date, result.period, result.number):
+                conflicts.append(Conflict(row, result))
+        else:
+            new.append(result)
+
+    return new, conflicts
+
+
+def complete_draws(conn, layout, year, month):
+    """Returns the number of draws stored for the given month if it's complete, otherwise None.
+
+    The month is complete when its draws run without a gap and the draw after
+    its last one is stored, i.e. its page wasn't cut off.
+    """
+    first_day = datetime.date(year, month, 1)
+    last_day = datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+    count, first, last = 0, None, None
+
+    for table in layout.tables(conn, first_day, last_day):
+        row = conn.execute(
+            select([func.count(), func.min(table.c.draw), func.max(table.c.draw)]).
+                where(table.c.date.between(first_day, last_day))
+        ).first()
+
+        if row[0]:
+            count += row[0]
+            first = row[1] if first is None else min(first, row[1])
+            last = row[2] if last is None else max(last, row[2])
+
+    if not count or count != last - first + 1:
+        return None
+
+    if not stored_rows(conn, layout.tables(conn, last_day + datetime.timedelta(days=1)), last + 1, last + 1):
+        return None
+
+    return count
+
+
+def checkpoint(conn, year, month, draws, layout=None):
+    """Records that the given month was fetched in full, with the given number of draws."""
+    layout = SingleTable() if layout is None else layout
+
+    conn.execute(
+        layout.checkpoints.insert().prefix_with('OR REPLACE'),
+        { 'year': year, 'month': month, 'draws': draws }
+    )
+
+
+@contextmanager
+def transaction(bind):
+    """Yields a connection that's in a transaction, joining the current one if bind is a connection."""
+    if isinstance(bind, Connection):
+        with bind.begin():
+            yield bind
+    else:
+        with bind.begin() as conn:
+            yield conn
+
+
+def refresh_counts(conn, start_date=None, end_date=None, source=schema.results, layout=None):
+    """Recomputes the daily and monthly counts from the results in the source table.
+
+    start_date and end_date, when given, must be the first and last days of
+    months. Only the counts from start_date to end_date are recomputed. The
+    counts are kept in the tables of the given layout, SingleTable by default.
+    """
+    layout = SingleTable() if layout is None else layout
+
+    results = source
+    daily = layout.daily_counts
+    monthly = layout.monthly_counts
+
+    def between(column, start, end):
+        clauses = []
+
+        if start is not None:
+            clauses.append(column >= start)
+
+        if end is not None:
+            clauses.append(column <= end)
+
+        return and_(true(), *clauses)
+
+    start_month = start_date and start_date.year * 12 + start_date.month
+    end_month = end_date and end_date.year * 12 + end_date.month
+
+    conn.execute(daily.delete().where(between(daily.c.date, start_date, end_date)))
+    conn.execute(daily.insert().from_select(
+        ['date', 'period_abbr', 'mark_number', 'count'],
+        select([results.c.date, results.c.period_abbr, results.c.mark_number, func.count()]).
+            where(between(results.c.date, start_date, end_date)).
+            group_by(results.c.date, results.c.period_abbr, results.c.mark_number)
+    ))
+
+    counts = Counter()
+    for row in conn.execute(select([daily]).where(between(daily.c.date, start_date, end_date))):
+        counts[(row.date.year, row.date.month, row.period_abbr, row.mark_number)] += row.count
+
+    conn.execute(monthly.delete().where(between(monthly.c.year * 12 + monthly.c.month, start_month, end_month)))
+
+    if counts:
+        conn.execute(monthly.insert(), [
+            { 'year': year, 'month': month, 'period_abbr': period, 'mark_number': number, 'count': count }
+            for (year, month, period, number), count in counts.items()
+        ])
+
+
+def select_daily_counts(start_date, end_date, period=None, daily=schema.daily_counts):
+    stmt = select([daily]). \
+        where(daily.c.date.between(start_date, end_date)). \
+        order_by(daily.c.date). \
+        order_by(case(PERIODS_ASC, value=daily.c.period_abbr)). \
+        order_by(daily.c.mark_number)
+
+    if period is not None:
+        stmt = stmt.where(daily.c.period_abbr == period)
+
+    return stmt
+
+
+def select_monthly_counts(start, end, period=None, monthly=schema.monthly_counts):
+    stmt = select([monthly]). \
+        where((monthly.c.year * 12 + monthly.c.month).between(start[0] * 12 + start[1], end[0] * 12 + end[1])). \
+        order_by(monthly.c.year). \
+        order_by(monthly.c.month). \
+        order_by(case(PERIODS_ASC, value=monthly.c.period_abbr)). \
+        order_by(monthly.c.mark_number)
+
+    if period is not None:
+        stmt = stmt.where(monthly.c.period_abbr == period)
+
+    return stmt
+
+
+def select_changes(since=0, limit=None, changes=schema.changes):
+    stmt = select([changes]). \
+        where(changes.c.seq > since). \
+        order_by(changes.c.seq)
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return stmt
+
 
 PERIODS_DESC = {
     'EM': 3,
@@ -106,9 +739,51 @@ PERIODS_DESC = {
 }
 
 
-def select_last_result():
-    return select([schema.results]). \
-        order_by(schema.results.c.date.desc()). \
-        order_by(case(PERIODS_DESC, value=schema.results.c.period_abbr)). \
-        order_by(schema.results.c.draw.desc()). \
+PERIODS_ASC = {
+    'EM': 0,
+    'AM': 1,
+    'AN': 2,
+    'PM': 3
+}
+
+
+def select_results(start_date=None, end_date=None, table=schema.results):
+    """Selects the results, from start_date and up to end_date if given, ordered by date, period and draw."""
+    stmt = select([table]). \
+        order_by(table.c.date). \
+        order_by(case(PERIODS_ASC, value=table.c.period_abbr)). \
+        order_by(table.c.draw)
+
+    if start_date is not None:
+        stmt = stmt.where(table.c.date >= start_date)
+
+    if end_date is not None:
+        stmt = stmt.where(table.c.date <= end_date)
+
+    return stmt
+
+
+def select_last_result(table=schema.results):
+    return select([table]). \
+        order_by(table.c.date.desc()). \
+        order_by(case(PERIODS_DESC, value=table.c.period_abbr)). \
+        order_by(table.c.draw.desc()). \
         limit(1)
+
+
+def select_appearances(number, limit, period=None, table=schema.results):
+    stmt = select([table]). \
+        where(table.c.mark_number == number). \
+        order_by(table.c.date.desc()). \
+        order_by(case(PERIODS_DESC, value=table.c.period_abbr)). \
+        order_by(table.c.draw.desc()). \
+        limit(limit)
+
+    if period is not None:
+        stmt = stmt.where(table.c.period_abbr == period)
+
+    return stmt
+
+
+def select_draw_date(aggregate, whereclause, table=schema.results):
+    return select([aggregate(table.c.date)]).where(whereclause)
@@ -0,0 +1,104 @@
+import datetime
+import itertools
+
+from collections import namedtuple
+
+from sqlalchemy import select
+
+from . import schema
+from ..common import month_range, periods_on
+
+
+# The kinds of problems that can be found in the stored results
+MISSING_DRAWS = 'missing-draws'
+MISSING_PERIODS = 'missing-periods'
+DUPLICATE_PERIOD = 'duplicate-period'
+OUT_OF_ORDER = 'out-of-order'
+OUT_OF_SCHEDULE = 'out-of-schedule'
+
+
+Problem = namedtuple('Problem', ['kind', 'draw', 'start_date', 'end_date', 'message'])
+
+
+def verify(conn, today=datetime.date.today, tables=(schema.results,), periods_on=periods_on):
+    """Yields the problems found in the results tables.
+
+    The results are streamed once, one table after the other and in draw order
+    within each table, and only the current row, the previous row and the
+    periods seen on the current day are kept in memory.
+
+    periods_on returns the periods that are scheduled on a given date. It
+    defaults to Play Whe's schedule, see playwhe.games.Game.periods_on for
+    other games.
+
+    Days on or after today are not checked for missing periods since their draws
+    may not have happened yet.
+    """
+    today = today()
+
+    prev = None
+    day = None
+    day_periods = set()
+
+    rows = itertools.chain.from_iterable(
+        conn.execution_options(stream_results=True).execute(select([table]).order_by(table.c.draw))
+        for table in tables
+    )
+
+    for row in rows:
+        if prev is not None:
+            if row.draw > prev.draw + 1:
+                yield Problem(MISSING_DRAWS, prev.draw + 1, prev.date, row.date,
+                    'draws {} to {} are missing between {} and {}'.format(prev.draw + 1, row.draw - 1, prev.date, row.date)
+                )
+
+            if row.date < prev.date:
+                yield Problem(OUT_OF_ORDER, row.draw, row.date, prev.date,
+                    'draw {} on {} comes after draw {} on {}'.format(row.draw, row.date, prev.draw, prev.date)
+                )
+
+        if row.period_abbr not in periods_on(row.date):
+            yield Problem(OUT_OF_SCHEDULE, row.draw, row.date, row.date,
+                'draw {} on {} has a period that was not scheduled: period={!r}'.format(row.draw, row.date, row.period_abbr)
+            )
+
+        if row.date != day:
+            if day is not None:
+                yield from _check_day(day, day_periods, prev.draw, today, periods_on)
+
+            day = row.date
+            day_periods = set()
+
+        if row.period_abbr in day_periods:
+            yield Problem(DUPLICATE_PERIOD, row.draw, row.date, row.date,
+                'draw {} on {} repeats a period: period={!r}'.format(row.draw, row.date, row.period_abbr)
+            )
+        else:
+            day_periods.add(row.period_abbr)
+
+        prev = row
+
+    if day is not None:
+        yield from _check_day(day, day_periods, prev.draw, today, periods_on)
+
+
+def _check_day(day, day_periods, draw, today, periods_on):
+    if day < today:
+        missing = [p for p in periods_on(day) if p not in day_periods]
+
+        if missing:
+            yield Problem(MISSING_PERIODS, draw, day, day,
+                '{} is missing periods: {}'.format(day, ', '.join(missing))
+            )
+
+
+def problem_months(problem):
+    """Returns, in order, the (year, month) pairs spanned by the given problem.
+
+    These are the months that need to be refetched in order to repair the
+    problem.
+    """
+    start = (problem.start_date.year, problem.start_date.month)
+    end = (problem.end_date.year, problem.end_date.month)
+
+    return list(month_range(start, end))
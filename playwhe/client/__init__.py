@@ -1,9 +1,19 @@
 from . import fetcher, parser
-from ..common import Params
+from .fetcher import Page, PageCache
+from ..common import Results, get_params
 
 
-def fetch(year, month, settings=None, post=None):
-    params = Params(year, month)
+def fetch(year, month, settings=None, post=None, cache=None, after=None):
+    """Fetches and parses the results for the given month.
+
+    When a PageCache is given and the month's page hasn't changed since it was
+    last recorded then no results are returned, without parsing the page.
+    Otherwise the Page is kept on the results, as page, so that it can be
+    recorded in the cache once the results are stored, see record_page. When
+    after is given only the results with a draw greater than after are
+    returned, see :func:`playwhe.client.parser.parse`.
+    """
+    params = get_params(year, month)
 
     kwargs = {}
 
@@ -13,4 +23,31 @@ def fetch(year, month, settings=None, post=None):
     if post is not None:
         kwargs['post'] = post
 
-    return parser.parse(fetcher.fetch(params, **kwargs), params)
+    if cache is not None:
+        kwargs['cache'] = cache
+
+    page = fetcher.fetch_page(params, **kwargs)
+
+    if page is None:
+        return Results([])
+
+    results = parser.parse(page.html, params, after=after)
+
+    if cache is not None:
+        results.page = page
+
+    return results
+
+
+def record_page(cache, year, month, results):
+    """Records the page that the results of the given month were fetched from, if they were all valid, and saves the cache.
+
+    It's meant to be called once the results are stored, e.g. as the
+    on_commit of :meth:`playwhe.cli.store.Store.update`, so that a page is
+    never skipped as unchanged before its results are stored.
+    """
+    page = getattr(results, 'page', None)
+
+    if page is not None and results.all_valid():
+        cache.record(get_params(year, month), page)
+        cache.save()
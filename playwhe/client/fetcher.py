@@ -1,16 +1,120 @@
+import hashlib
+import json
+import os
+
+from collections import namedtuple
+
 import requests
 
 from ..common import Settings
 from ..errors import BadStatusCodeError, ServiceUnavailableError
+from ..profiling import span
+
+
+# A fetched page along with what's needed to tell whether it changed the next
+# time it's fetched, see PageCache
+Page = namedtuple('Page', ['html', 'digest', 'etag', 'last_modified'])
+
+
+class PageCache:
+    """Remembers the content hash, ETag and Last-Modified of the page of each month.
+
+    It's used by fetch_page to tell when a page hasn't changed since it was
+    last recorded. Pages are only recorded when record is called, which should
+    be once their results are stored. When path is given the entries are
+    loaded from, and can be saved to, a JSON file so that they survive between
+    runs.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(params):
+        return '{}-{}'.format(params.yy, params.mmm)
+
+    def get(self, params):
+        return self.entries.get(self.key(params), {})
+
+    def put(self, params, digest, etag=None, last_modified=None):
+        entry = { 'digest': digest }
+
+        if etag is not None:
+            entry['etag'] = etag
+
+        if last_modified is not None:
+            entry['last_modified'] = last_modified
+
+        self.entries[self.key(params)] = entry
+
+    def record(self, params, page):
+        self.put(params, page.digest, page.etag, page.last_modified)
 
+    def save(self):
+        if self.path is not None:
+            with open(self.path, 'w') as f:
+                json.dump(self.entries, f)
+
+
+def fetch(params, settings=Settings(), post=requests.post, cache=None):
+    """Returns the HTML of the page for the month given by params.
+
+    When a cache is given None is returned if the page hasn't changed, see
+    fetch_page.
+    """
+    page = fetch_page(params, settings=settings, post=post, cache=cache)
+
+    return None if page is None else page.html
+
+
+def fetch_page(params, settings=Settings(), post=requests.post, cache=None):
+    """Returns the Page for the month given by params.
+
+    When a cache is given the page is requested conditionally and None is
+    returned if it hasn't changed since it was last recorded, either because
+    the server says so or because its content hash is the same. The cache
+    itself isn't changed, the caller records the Page once it's done with it.
+    """
+    kwargs = {}
+    entry = {}
+
+    if cache is not None:
+        entry = cache.get(params)
+        headers = {}
+
+        if 'etag' in entry:
+            headers['If-None-Match'] = entry['etag']
+
+        if 'last_modified' in entry:
+            headers['If-Modified-Since'] = entry['last_modified']
+
+        if headers:
+            kwargs['headers'] = headers
 
-def fetch(params, settings=Settings(), post=requests.post):
     try:
-        response = post(settings.url, data={ 'year': params.yy, 'month': params.mmm }, timeout=settings.timeout)
+        with span('fetch'):
+            response = post(settings.url, data={ 'year': params.yy, 'month': params.mmm }, timeout=settings.timeout, **kwargs)
     except requests.RequestException:
         raise ServiceUnavailableError
     else:
-        if response.status_code == 200:
-            return response.text
+        if cache is not None and response.status_code == 304:
+            return None
+        elif response.status_code == 200:
+            html = response.text
+
+            if cache is None:
+                return Page(html, None, None, None)
+
+            digest = hashlib.sha1(html.encode('utf-8')).hexdigest()
+
+            if digest == entry.get('digest'):
+                return None
+
+            return Page(html, digest, response.headers.get('ETag'), response.headers.get('Last-Modified'))
         else:
             raise BadStatusCodeError(response.status_code)
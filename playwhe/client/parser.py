@@ -1,6 +1,7 @@
 import re
 
 from ..common import Result, Results
+from ..profiling import span
 
 
 # Each result has the format:
@@ -9,10 +10,44 @@ from ..common import Result, Results
 #   <strong> Date: </strong>[dd]-[mmm]-[yy]<br>
 #   <strong> Mark Drawn: </strong>[number]<br>
 #   <strong> Drawn at: </strong>[period]
-RESULT_RE = r'Draw #: </strong>(\d+).*? Date: </strong>(\d{1,2})-%s-%s.*? Mark Drawn: </strong>(\d+).*? Drawn at: </strong>(EM|AM|AN|PM)'
+#
+# The gaps between the fields are bounded. With unbounded .*? gaps a page that
+# repeats the start of a result without ever finishing it takes time cubic in
+# its length to scan, and a result with a bad date gets paired with the fields
+# of the next one.
+RESULT_RE = r'Draw #: </strong>(\d+).{0,64}? Date: </strong>(\d{1,2})-%s-%s.{0,64}? Mark Drawn: </strong>(\d+).{0,64}? Drawn at: </strong>(EM|AM|AN|PM)'
+
+
+# Where the result with the given draw starts
+DRAW_RE = r'Draw #: </strong>%d(?!\d)'
+
+
+def parse(html, params, after=None, result_re=RESULT_RE, result_class=Result):
+    """Returns the results on the page for the month given by params.
+
+    result_re and result_class default to Play Whe's, see playwhe.games for
+    other games.
+
+    When after is given only the results with a draw greater than after are
+    returned. The page lists its results in draw order, so if the result with
+    draw after is on the page then the scan starts from it instead of from the
+    start of the page.
+    """
+    pos = 0
+
+    if after is not None:
+        match = re.search(DRAW_RE % after, html, re.IGNORECASE)
+
+        if match:
+            pos = match.end()
+
+    with span('parse'):
+        matches = list(re.compile(result_re % (params.mmm, params.yy), re.IGNORECASE).finditer(html, pos))
 
+    with span('validate'):
+        results = Results(result_class(m[1], params.year, params.month, m[2], m[4], m[3]) for m in matches)
 
-def parse(html, params):
-    matches = re.findall(RESULT_RE % (params.mmm, params.yy), html, re.IGNORECASE)
+    if after is not None:
+        results[:] = [r for r in results if r.draw > after]
 
-    return Results(Result(m[0], params.year, params.month, m[1], m[3], m[2]) for m in matches)
+    return results
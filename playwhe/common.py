@@ -1,10 +1,25 @@
+import bz2
 import csv
 import datetime
+import gzip
+import io
+import lzma
+
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+from itertools import accumulate
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from .constants import MAX_NUMBER, MIN_NUMBER, \
     MAX_YEAR, MIN_YEAR, \
-    PERIODS_ABBR, \
-    START_DATE
+    AM, EM, PM, PERIODS_ABBR, \
+    FOUR_DRAWS_DATE, START_DATE, THREE_DRAWS_DATE
+from .errors import PlayWheError
 
 
 class Params:
@@ -47,6 +62,25 @@ def to_mmm(month):
     return MONTHS_ABBR[month]
 
 
+# A table of the Params for every month from MIN_YEAR to MAX_YEAR
+PARAMS = {
+    (year, month): Params(year, month)
+    for year in range(MIN_YEAR, MAX_YEAR + 1)
+    for month in range(1, 13)
+}
+
+
+def get_params(year, month):
+    """Returns the Params for the given year and month from the PARAMS table.
+
+    Raises ValueError, just like Params, if the year or month is invalid.
+    """
+    try:
+        return PARAMS[(year, month)]
+    except (KeyError, TypeError):
+        return Params(year, month)
+
+
 class Settings:
     DEFAULT_TIMEOUT = 5
     DEFAULT_URL = 'http://nlcb.co.tt/app/index.php/pwresults/playwhemonthsum'
@@ -60,6 +94,11 @@ class Settings:
 
 
 class Result:
+    # What a valid result looks like. Subclasses for other games override these.
+    MIN_NUMBER = MIN_NUMBER
+    MAX_NUMBER = MAX_NUMBER
+    PERIODS_ABBR = PERIODS_ABBR
+
     @classmethod
     def from_csvline(cls, csvline, delimiter=','):
         if isinstance(csvline, str):
@@ -116,15 +155,15 @@ class Result:
 
         # Clean and validate period
         period = _parse_str(period).upper()
-        if period not in PERIODS_ABBR:
-            errors.append('period must be one of {}: period={!r}'.format(', '.join(PERIODS_ABBR), original_args['period']))
+        if period not in self.PERIODS_ABBR:
+            errors.append('period must be one of {}: period={!r}'.format(', '.join(self.PERIODS_ABBR), original_args['period']))
         else:
             self.period = period
 
         # Clean and validate number
         number = _parse_int(number)
-        if number < MIN_NUMBER or number > MAX_NUMBER:
-            errors.append('number must be an integer between {} and {} inclusive: number={!r}'.format(MIN_NUMBER, MAX_NUMBER, original_args['number']))
+        if number < self.MIN_NUMBER or number > self.MAX_NUMBER:
+            errors.append('number must be an integer between {} and {} inclusive: number={!r}'.format(self.MIN_NUMBER, self.MAX_NUMBER, original_args['number']))
         else:
             self.number = number
 
@@ -166,46 +205,202 @@ def _parse_str(x):
         return ''
 
 
+# The number of invalid results that are kept, by default, for the error messages
+MAX_ERROR_SAMPLES = 100
+
+
+class ErrorReport:
+    """Keeps track of invalid results in a bounded amount of memory.
+
+    Only the first max_samples invalid results are kept, as samples, but every
+    one of them is counted in total and each of their errors is counted by
+    type in counts. The type of an error is its message without the values,
+    e.g. 'draw must be a positive integer'.
+
+    When reject_file, a text file, is given the CSV fields of every invalid
+    result, or its repr if it wasn't read from a CSV file, are written to it as
+    a CSV row as soon as it's found.
+    """
+
+    def __init__(self, max_samples=MAX_ERROR_SAMPLES, reject_file=None):
+        self.max_samples = max_samples
+        self.reject_file = reject_file
+        self.reject_writer = None if reject_file is None else csv.writer(reject_file, lineterminator='\n')
+
+        self.samples = []
+        self.total = 0
+        self.counts = Counter()
+
+    def __len__(self):
+        return self.total
+
+    def __getstate__(self):
+        # Open files can't be sent to other processes
+        return dict(self.__dict__, reject_file=None, reject_writer=None)
+
+    def add(self, result):
+        self.total += 1
+        self.counts.update(error.partition(':')[0] for error in result.errors)
+
+        if len(self.samples) < self.max_samples:
+            self.samples.append(result)
+
+        if self.reject_writer is not None:
+            self.reject_writer.writerow(result.fields if hasattr(result, 'fields') else [repr(result)])
+
+    def update(self, other):
+        """Adds the counts and, up to max_samples, the samples of the other ErrorReport."""
+        self.total += other.total
+        self.counts.update(other.counts)
+        self.samples.extend(other.samples[:max(0, self.max_samples - len(self.samples))])
+
+    def full_error_messages(self):
+        messages = '\n'.join(map(lambda r: r.full_error_message(), self.samples))
+
+        if self.total > len(self.samples):
+            messages += '\n... and {} more invalid results\n\nErrors by type:\n'.format(self.total - len(self.samples))
+            messages += '\n'.join('    {}: {}'.format(error, n) for error, n in sorted(self.counts.items()))
+
+        footer = 'Total errors = {}'.format(self.total)
+
+        return messages + '\n\n' + footer
+
+
 class Results(list):
+    """The valid results.
+
+    The invalid ones are recorded in error_report, an ErrorReport, and the
+    ones it keeps as samples are available as invalid.
+    """
+
     @classmethod
-    def from_csvfile(cls, csvfile):
+    def from_csvfile(cls, csvfile, result_class=Result, error_report=None):
         delimiter = csv.get_dialect('excel').delimiter
 
-        results = []
+        def read():
+            for lineno, line in enumerate(csv.reader(csvfile), start=1):
+                contents = delimiter.join(line)
 
-        for lineno, line in enumerate(csv.reader(csvfile), start=1):
-            contents = delimiter.join(line)
+                if contents.strip():
+                    result = result_class.from_csvline(line, delimiter=delimiter)
 
-            if contents.strip():
-                result = Result.from_csvline(line, delimiter=delimiter)
+                    # Track these values for error reporting purposes
+                    result.lineno = lineno
+                    result.line = contents
 
-                # Track these values for error reporting purposes
-                result.lineno = lineno
-                result.line = contents
+                    if not result.is_valid():
+                        result.fields = line
 
-                results.append(result)
+                    yield result
 
-        return cls(results)
+        return cls(read(), error_report=error_report)
 
-    def __init__(self, results):
+    def __init__(self, results, error_report=None):
         super().__init__()
 
-        self.invalid = []
+        self.error_report = ErrorReport() if error_report is None else error_report
+        self.invalid = self.error_report.samples
 
         for result in results:
             if result.is_valid():
                 self.append(result)
             else:
-                self.invalid.append(result)
+                self.error_report.add(result)
 
     def all_valid(self):
-        return not bool(self.invalid)
+        return not self.error_report.total
 
     def full_error_messages(self):
-        messages = '\n'.join(map(lambda r: r.full_error_message(), self.invalid))
-        footer = 'Total errors = {}'.format(len(self.invalid))
+        return self.error_report.full_error_messages()
 
-        return messages + '\n\n' + footer
+
+# The size of the buffers used when reading, and decompressing, CSV files
+BUFFER_SIZE = 64 * 1024
+
+
+# The compression formats that are detected, by their magic numbers, when reading CSV files
+GZIP = 'gzip'
+BZ2 = 'bz2'
+XZ = 'xz'
+ZSTD = 'zstd'
+
+MAGIC_NUMBERS = (
+    (b'\x1f\x8b', GZIP),
+    (b'BZh', BZ2),
+    (b'\xfd7zXZ\x00', XZ),
+    (b'\x28\xb5\x2f\xfd', ZSTD)
+)
+
+
+@contextmanager
+def open_csvfile(source):
+    """Yields a text stream for reading the CSV data in source.
+
+    source may be a path, a binary file or a text file. Paths and binary files
+    that are compressed with gzip, bzip2, xz or zstd (if the zstandard package
+    is installed) are decompressed as they are read, through buffers of
+    BUFFER_SIZE bytes. Text files are used as is.
+
+    Only the files that are opened here are closed afterwards.
+    """
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+
+    if isinstance(source, str):
+        raw = open(source, 'rb', buffering=BUFFER_SIZE)
+    else:
+        raw = source if hasattr(source, 'peek') else io.BufferedReader(source, BUFFER_SIZE)
+
+    try:
+        compression = compression_of(raw)
+        stream = raw if compression is None else decompress(raw, compression)
+        textfile = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+
+        try:
+            yield textfile
+        finally:
+            if stream is raw:
+                textfile.detach()
+            else:
+                textfile.close()
+    finally:
+        if raw is not source:
+            if isinstance(source, str):
+                raw.close()
+            else:
+                raw.detach()
+
+
+def compression_of(stream):
+    """Returns the compression format of the given buffered binary stream, or None if it isn't compressed.
+
+    The stream isn't advanced.
+    """
+    head = stream.peek(6)[:6]
+
+    for magic_number, compression in MAGIC_NUMBERS:
+        if head.startswith(magic_number):
+            return compression
+
+    return None
+
+
+def decompress(stream, compression):
+    """Returns a binary stream that decompresses the given stream as it is read."""
+    if compression == GZIP:
+        return gzip.GzipFile(fileobj=stream, mode='rb')
+    elif compression == BZ2:
+        return bz2.BZ2File(stream)
+    elif compression == XZ:
+        return lzma.LZMAFile(stream)
+    elif compression == ZSTD:
+        if zstandard is None:
+            raise PlayWheError('the zstandard package is needed to read zstd compressed files')
+
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(stream, read_size=BUFFER_SIZE, closefd=False), BUFFER_SIZE)
+    else:
+        raise ValueError('compression must be one of {}: compression={!r}'.format(', '.join(c for _, c in MAGIC_NUMBERS), compression))
 
 
 def date_range(start_date=None, period=PERIODS_ABBR[0], today=datetime.date.today):
@@ -217,12 +412,107 @@ def date_range(start_date=None, period=PERIODS_ABBR[0], today=datetime.date.toda
 
     end_date = today()
 
-    start_year = start_date.year
-    end_year = end_date.year
+    return month_range((start_date.year, start_date.month), (end_date.year, end_date.month))
+
+
+def month_range(start, end):
+    """Yields, in order, the (year, month) pairs from start to end inclusive.
+
+    start and end are (year, month) pairs.
+    """
+    year, month = start
+
+    while (year, month) <= tuple(end):
+        yield year, month
+
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+# The periods that are scheduled in each era, indexed by the values in SCHEDULE
+ERAS = ((), (AM, PM), (EM, AM, PM), PERIODS_ABBR)
+
+
+# The last date covered by the calendar tables
+CALENDAR_END_DATE = datetime.date(MAX_YEAR, 12, 31)
+
+
+def _build_schedule():
+    schedule = bytearray()
+
+    for era, (begin, end) in enumerate([
+        (START_DATE, THREE_DRAWS_DATE),
+        (THREE_DRAWS_DATE, FOUR_DRAWS_DATE),
+        (FOUR_DRAWS_DATE, CALENDAR_END_DATE + datetime.timedelta(days=1))
+    ], start=1):
+        schedule.extend(bytes([era]) * (end - begin).days)
+
+    # Play Whe isn't drawn on Sundays
+    first_sunday = (6 - START_DATE.weekday()) % 7
+    schedule[first_sunday::7] = bytes(len(range(first_sunday, len(schedule), 7)))
+
+    return bytes(schedule)
+
+
+# For each day from START_DATE to CALENDAR_END_DATE, the index into ERAS of the
+# periods that are scheduled on that day
+SCHEDULE = _build_schedule()
+
+
+# DRAWS_BEFORE[i] is the number of draws scheduled before the i-th day of SCHEDULE
+DRAWS_BEFORE = array('l', [0])
+DRAWS_BEFORE.extend(accumulate(SCHEDULE.translate(bytes(len(ERAS[i]) if i < len(ERAS) else 0 for i in range(256)))))
+
+
+def _offset(date):
+    return date.toordinal() - START_DATE.toordinal()
+
+
+def periods_on(date):
+    """Returns the abbreviations of the periods that are scheduled to be drawn on the given date.
+
+    The schedule depends on the era the date falls in. There are no periods
+    before Play Whe started or on Sundays.
+    """
+    offset = _offset(date)
+
+    if offset < 0:
+        return ()
+    elif offset < len(SCHEDULE):
+        return ERAS[SCHEDULE[offset]]
+    else:
+        return () if date.weekday() == 6 else PERIODS_ABBR
+
+
+def draws_on(date):
+    """Returns the number of draws that are scheduled on the given date."""
+    return len(periods_on(date))
+
+
+def scheduled_draws(start_date, end_date):
+    """Returns the number of draws scheduled from start_date to end_date inclusive.
+
+    Only the dates covered by the calendar, i.e. from START_DATE to
+    CALENDAR_END_DATE, are counted.
+    """
+    start = min(max(_offset(start_date), 0), len(SCHEDULE))
+    end = min(max(_offset(end_date) + 1, 0), len(SCHEDULE))
+
+    return max(DRAWS_BEFORE[end] - DRAWS_BEFORE[start], 0)
+
+
+def _build_month_draws():
+    month_draws = {}
+
+    for year, month in month_range((MIN_YEAR, 1), (MAX_YEAR, 12)):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+        month_draws[(year, month)] = scheduled_draws(
+            datetime.date(year, month, 1),
+            datetime.date(next_year, next_month, 1) - datetime.timedelta(days=1)
+        )
+
+    return month_draws
 
-    for year in range(start_year, end_year + 1):
-        start_month = start_date.month if year == start_year else 1
-        end_month = end_date.month if year == end_year else 12
 
-        for month in range(start_month, end_month + 1):
-            yield year, month
+# The number of draws scheduled in every month from MIN_YEAR to MAX_YEAR
+MONTH_DRAWS = _build_month_draws()
@@ -0,0 +1,149 @@
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .client import fetcher, parser
+from .common import Result, Results, Settings, get_params, periods_on
+from .constants import MAX_NUMBER, MIN_NUMBER, PERIODS_ABBR, START_DATE
+
+
+logger = logging.getLogger(__name__)
+
+
+class Game:
+    """A game that NLCB draws and publishes monthly result pages for.
+
+    A game has its own number range, periods, page format (result_re, see
+    playwhe.client.parser.RESULT_RE) and endpoint. Its results are validated
+    with result_class which, unless given, is a Result subclass that knows
+    its number range and periods.
+
+    The periods must be drawn from PERIODS_ABBR since they share Play Whe's
+    draw times.
+    """
+
+    def __init__(self, name, min_number, max_number, periods, result_re, url, start_date=START_DATE, result_class=None):
+        if not name.isidentifier():
+            raise ValueError('name must be a valid identifier: {!r}'.format(name))
+
+        if not min_number <= max_number:
+            raise ValueError('min_number must be at most max_number: min_number={!r}, max_number={!r}'.format(min_number, max_number))
+
+        periods = tuple(periods)
+
+        if not periods or not set(periods) <= set(PERIODS_ABBR):
+            raise ValueError('periods must be some of {}: periods={!r}'.format(', '.join(PERIODS_ABBR), periods))
+
+        self.name = name
+        self.min_number = min_number
+        self.max_number = max_number
+        self.periods = periods
+        self.result_re = result_re
+        self.url = url
+        self.start_date = start_date
+
+        if result_class is None:
+            result_class = type('{}Result'.format(name.title().replace('_', '')), (Result,), {
+                'MIN_NUMBER': min_number,
+                'MAX_NUMBER': max_number,
+                'PERIODS_ABBR': periods
+            })
+
+        self.result_class = result_class
+
+    def settings(self, timeout=Settings.DEFAULT_TIMEOUT):
+        return Settings(timeout=timeout, url=self.url)
+
+    def parse(self, html, params, after=None):
+        return parser.parse(html, params, after=after, result_re=self.result_re, result_class=self.result_class)
+
+    def fetch(self, year, month, settings=None, post=None, cache=None, after=None):
+        """Fetches and parses the game's results for the given month, see :func:`playwhe.client.fetch`."""
+        params = get_params(year, month)
+
+        kwargs = { 'settings': self.settings() if settings is None else settings }
+
+        if post is not None:
+            kwargs['post'] = post
+
+        if cache is not None:
+            kwargs['cache'] = cache
+
+        page = fetcher.fetch_page(params, **kwargs)
+
+        if page is None:
+            return Results([])
+
+        results = self.parse(page.html, params, after=after)
+
+        if cache is not None:
+            results.page = page
+
+        return results
+
+    def periods_on(self, date):
+        """Returns the abbreviations of the game's periods that are scheduled to be drawn on the given date."""
+        if date < self.start_date:
+            return ()
+
+        return tuple(p for p in periods_on(date) if p in self.periods)
+
+    def layout(self):
+        """Returns the layout of the game's tables, see playwhe.cli.layouts."""
+        from .cli.layouts import GameTables, SingleTable
+
+        return SingleTable() if self is PLAY_WHE else GameTables(self.name)
+
+    def __repr__(self):
+        return '{}(name={!r}, min_number={!r}, max_number={!r}, periods={!r})'.format(self.__class__.__name__, self.name, self.min_number, self.max_number, self.periods)
+
+
+PLAY_WHE = Game('playwhe', MIN_NUMBER, MAX_NUMBER, PERIODS_ABBR, parser.RESULT_RE, Settings.DEFAULT_URL, result_class=Result)
+
+
+# The registered games by name
+GAMES = { PLAY_WHE.name: PLAY_WHE }
+
+
+def register(game):
+    """Registers the game so that it can be looked up by name, for e.g. by the CLI."""
+    if game.name in GAMES:
+        raise ValueError('a game with that name is already registered: {!r}'.format(game.name))
+
+    GAMES[game.name] = game
+
+    return game
+
+
+def get_game(name):
+    try:
+        return GAMES[name]
+    except KeyError:
+        raise ValueError('game must be one of {}: {!r}'.format(', '.join(sorted(GAMES)), name))
+
+
+def update_games(bind, games, today=None, workers=None, post=None):
+    """Updates the stored results of each of the games concurrently.
+
+    All the games share bind, and so its connection pool, but each game's
+    results go into its own tables. Returns a dict from each game's name to
+    the exception that stopped its update, if any.
+    """
+    from .cli.store import Store
+
+    def update(game):
+        fetch = game.fetch
+
+        if post is not None:
+            fetch = lambda year, month, **kwargs: game.fetch(year, month, post=post, **kwargs)
+
+        try:
+            Store(bind, layout=game.layout()).update(fetch=fetch, today=today, start_date=game.start_date)
+        except Exception as e:
+            logger.exception('Update of {} failed!'.format(game.name))
+            return game.name, e
+        else:
+            return game.name, None
+
+    with ThreadPoolExecutor(max_workers=workers or len(games) or 1) as executor:
+        return { name: error for name, error in executor.map(update, games) if error is not None }
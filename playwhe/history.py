@@ -0,0 +1,126 @@
+import datetime
+
+from array import array
+
+from .common import Result, Results, open_csvfile
+from .constants import PERIODS_ABBR
+
+
+# Identifies files written by History.save
+MAGIC_NUMBER = b'PWH1'
+
+
+class History:
+    """A columnar snapshot of results ordered by date, period and draw.
+
+    Each result is stored across four parallel arrays:
+
+    - draws, the draw numbers
+    - days, the dates as proleptic Gregorian ordinals
+    - periods, the indices of the periods in PERIODS_ABBR
+    - numbers, the numbers that were drawn
+    """
+
+    @classmethod
+    def from_results(cls, results):
+        history = cls()
+        history.extend(sorted(results, key=result_key))
+
+        return history
+
+    @classmethod
+    def from_csvfile(cls, csvfile):
+        with open_csvfile(csvfile) as f:
+            return cls.from_results(Results.from_csvfile(f))
+
+    @classmethod
+    def from_store(cls, store, start_date=None):
+        """Returns the history of the results in the given Store, from start_date if given.
+
+        The results are read through the store, so they come from the tables of
+        its layout.
+        """
+        history = cls()
+
+        for row in store.results(start_date):
+            history.append_row(row.draw, row.date.toordinal(), PERIODS_ABBR.index(row.period_abbr), row.mark_number)
+
+        return history
+
+    @classmethod
+    def load(cls, path):
+        history = cls()
+
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC_NUMBER)) != MAGIC_NUMBER:
+                raise ValueError('not a history file: path={!r}'.format(path))
+
+            n = int.from_bytes(f.read(8), 'little')
+
+            for column in history.columns():
+                column.fromfile(f, n)
+
+        return history
+
+    def __init__(self):
+        self.draws = array('q')
+        self.days = array('q')
+        self.periods = array('b')
+        self.numbers = array('b')
+
+    def __len__(self):
+        return len(self.draws)
+
+    def columns(self):
+        return self.draws, self.days, self.periods, self.numbers
+
+    def key(self, i):
+        """Returns the (day, period, draw) key that orders the i-th result."""
+        return self.days[i], self.periods[i], self.draws[i]
+
+    def last_key(self):
+        return self.key(-1) if self.draws else None
+
+    def append_row(self, draw, day, period, number):
+        self.draws.append(draw)
+        self.days.append(day)
+        self.periods.append(period)
+        self.numbers.append(number)
+
+    def extend(self, results):
+        """Appends the valid results that come after the last result in the history.
+
+        The results are expected to be in order. Returns the results that were
+        appended.
+        """
+        appended = []
+        last_key = self.last_key()
+
+        for result in results:
+            if result.is_valid():
+                key = result_key(result)
+
+                if last_key is None or key > last_key:
+                    self.append_row(result.draw, key[0], key[1], result.number)
+                    appended.append(result)
+                    last_key = key
+
+        return appended
+
+    def result(self, i):
+        date = datetime.date.fromordinal(self.days[i])
+
+        return Result(self.draws[i], date.year, date.month, date.day, PERIODS_ABBR[self.periods[i]], self.numbers[i])
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(MAGIC_NUMBER)
+            f.write(len(self).to_bytes(8, 'little'))
+
+            for column in self.columns():
+                column.tofile(f)
+
+
+def result_key(result):
+    """Returns the (day, period, draw) key that orders the given result."""
+    return result.date.toordinal(), PERIODS_ABBR.index(result.period), result.draw
@@ -0,0 +1,244 @@
+import os
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .analytics import SIZE
+from .constants import MIN_NUMBER, PERIODS_ABBR
+from .common import Result
+from .history import History, result_key
+
+
+MAGIC_NUMBER = b'PWI2'
+
+
+class Index:
+    """Reverse lookups from marks, periods and dates to the results of a history.
+
+    The results are referred to by their positions in the history, which are
+    ordered by date, period and draw:
+
+    - marks[j] holds the positions of the results where MIN_NUMBER + j was drawn
+    - periods[p] holds the positions of the results of PERIODS_ABBR[p]
+    - mark_periods[j * len(PERIODS_ABBR) + p] holds the positions of the
+      results where MIN_NUMBER + j was drawn in PERIODS_ABBR[p]
+    - offsets[k] is the position of the first result drawn on or after the day
+      first_day + k, so the results of a day are found without a search
+
+    Every list is sorted, so ranges of dates or draws are found by binary
+    search. Ranges of draws assume that the draws increase with the positions,
+    as they do for Play Whe's results.
+
+    Use extend, for e.g. as a Store subscriber, to index newly inserted results.
+    """
+
+    @classmethod
+    def from_history(cls, history):
+        index = cls()
+
+        for i in range(len(history)):
+            index._append_row(history.draws[i], history.days[i], history.periods[i], history.numbers[i])
+
+        return index
+
+    @classmethod
+    def from_store(cls, store, path=None):
+        """Returns the index of the results in the given Store.
+
+        If path is given then the index that is saved there is loaded,
+        extended with the results that were logged in the store's change log
+        since it was saved and then saved again. See extend for what happens
+        when one of those results comes before the last one indexed.
+        """
+        # Read before the results so that nothing inserted in between is missed
+        seq = store.last_seq()
+        index = None
+
+        if path is not None and os.path.exists(path):
+            index = cls.load(path)
+
+            if index.seq is not None:
+                index.extend(sorted(map(change_result, store.changes(index.seq)), key=result_key))
+            else:
+                index = None
+
+        if index is None:
+            index = cls.from_history(History.from_store(store))
+
+        index.seq = seq
+
+        if path is not None:
+            index.save(path)
+
+        return index
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC_NUMBER)) != MAGIC_NUMBER:
+                raise ValueError('not an index file: path={!r}'.format(path))
+
+            index.first_day = int.from_bytes(f.read(8), 'little', signed=True)
+
+            seq = int.from_bytes(f.read(8), 'little', signed=True)
+            index.seq = None if seq < 0 else seq
+
+            for column in index._arrays():
+                column.fromfile(f, int.from_bytes(f.read(8), 'little'))
+
+        return index
+
+    def __init__(self):
+        self._clear()
+
+        # The last seq of the store's change log that was indexed, see from_store
+        self.seq = None
+
+    def _clear(self):
+        self.history = History()
+
+        self.marks = [array('q') for _ in range(SIZE)]
+        self.periods = [array('q') for _ in PERIODS_ABBR]
+        self.mark_periods = [array('q') for _ in range(SIZE * len(PERIODS_ABBR))]
+
+        self.first_day = 0
+        self.offsets = array('q')
+
+    def __len__(self):
+        return len(self.history)
+
+    def _arrays(self):
+        return [*self.history.columns(), self.offsets, *self.marks, *self.periods, *self.mark_periods]
+
+    def _append_row(self, draw, day, period, number):
+        position = len(self.history)
+
+        if not self.offsets:
+            self.first_day = day
+            self.offsets.append(0)
+
+        # Every day up to and including this one now starts at or before position
+        while self.first_day + len(self.offsets) <= day:
+            self.offsets.append(position)
+
+        self.history.append_row(draw, day, period, number)
+
+        j = number - MIN_NUMBER
+
+        self.marks[j].append(position)
+        self.periods[period].append(position)
+        self.mark_periods[j * len(PERIODS_ABBR) + period].append(position)
+
+    def extend(self, results):
+        """Indexes the results that haven't been indexed yet.
+
+        The results are expected to be in order. If any of them comes before
+        the last result indexed, e.g. one inserted by --refetch or --repair,
+        the index is built again from scratch since the positions of the
+        results after it change. Returns the results that were indexed.
+        """
+        results = [result for result in results if result.is_valid()]
+        appended = History()
+        last_key = self.history.last_key()
+
+        if last_key is not None:
+            draws = set(self.history.draws)
+            older = [r for r in results if result_key(r) <= last_key and r.draw not in draws]
+
+            if older:
+                indexed = sorted(older + [r for r in results if result_key(r) > last_key], key=result_key)
+                history = History.from_results([self.history.result(i) for i in range(len(self.history))] + indexed)
+
+                self._clear()
+
+                for i in range(len(history)):
+                    self._append_row(history.draws[i], history.days[i], history.periods[i], history.numbers[i])
+
+                return indexed
+
+            day, period, draw = last_key
+            appended.append_row(draw, day, period, 0)
+
+        results = appended.extend(results)
+
+        for i in range(1 if last_key is not None else 0, len(appended)):
+            self._append_row(appended.draws[i], appended.days[i], appended.periods[i], appended.numbers[i])
+
+        return results
+
+    def day_span(self, start_date=None, end_date=None):
+        """Returns the (start, end) positions of the results from start_date to end_date inclusive."""
+        start = 0 if start_date is None else self._day_offset(start_date.toordinal())
+        end = len(self.history) if end_date is None else self._day_offset(end_date.toordinal() + 1)
+
+        return start, max(start, end)
+
+    def _day_offset(self, day):
+        k = day - self.first_day
+
+        if k < 0 or not self.offsets:
+            return 0
+        elif k >= len(self.offsets):
+            return len(self.history)
+        else:
+            return self.offsets[k]
+
+    def draw_span(self, first=None, last=None):
+        """Returns the (start, end) positions of the results with draws from first to last inclusive."""
+        draws = self.history.draws
+
+        start = 0 if first is None else bisect_left(draws, first)
+        end = len(draws) if last is None else bisect_right(draws, last)
+
+        return start, max(start, end)
+
+    def positions(self, number=None, period=None, start=0, end=None):
+        """Returns the positions, from start up to but excluding end, of the results with the given number and period."""
+        if end is None:
+            end = len(self.history)
+
+        if number is None and period is None:
+            return array('q', range(start, end))
+
+        if number is None:
+            positions = self.periods[PERIODS_ABBR.index(period)]
+        elif period is None:
+            positions = self.marks[number - MIN_NUMBER]
+        else:
+            positions = self.mark_periods[(number - MIN_NUMBER) * len(PERIODS_ABBR) + PERIODS_ABBR.index(period)]
+
+        return positions[bisect_left(positions, start):bisect_left(positions, end)]
+
+    def results(self, number=None, period=None, start_date=None, end_date=None, first=None, last=None):
+        """Returns the results with the given number and period, from start_date to end_date and with draws from first to last.
+
+        Every argument is optional and only narrows the results.
+        """
+        start, end = self.day_span(start_date, end_date)
+
+        if first is not None or last is not None:
+            draw_start, draw_end = self.draw_span(first, last)
+            start, end = max(start, draw_start), min(end, draw_end)
+
+        return [self.history.result(i) for i in self.positions(number, period, start, max(start, end))]
+
+    def on(self, date):
+        """Returns the results drawn on the given date."""
+        return self.results(start_date=date, end_date=date)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(MAGIC_NUMBER)
+            f.write(self.first_day.to_bytes(8, 'little', signed=True))
+            f.write((-1 if self.seq is None else self.seq).to_bytes(8, 'little', signed=True))
+
+            for column in self._arrays():
+                f.write(len(column).to_bytes(8, 'little'))
+                column.tofile(f)
+
+
+def change_result(row):
+    """Returns the Result of a (seq, draw, date, period_abbr, mark_number) row of the change log."""
+    return Result(row.draw, row.date.year, row.date.month, row.date.day, row.period_abbr, row.mark_number)
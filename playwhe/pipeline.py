@@ -0,0 +1,144 @@
+import time
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from ctypes import c_byte, c_longlong
+from multiprocessing.sharedctypes import RawArray
+
+from .analytics import SIZE
+from .constants import MIN_NUMBER, PERIODS_ABBR
+from .errors import PlayWheError
+from .stats import chi_square, monte_carlo, runs_test, serial_correlation
+
+
+# A summary of the gaps, in draws, between the appearances of a mark
+MarkSummary = namedtuple('MarkSummary', ['number', 'count', 'mean_gap', 'max_gap', 'current_gap'])
+
+
+Timing = namedtuple('Timing', ['serial', 'parallel', 'speedup'])
+
+
+class SharedHistory:
+    """The columns of a History in shared memory.
+
+    It's passed to the workers of a process pool when they start, so each
+    worker reads the same memory instead of getting its own copy of the
+    history. The columns are exposed as memoryviews.
+    """
+
+    def __init__(self, history):
+        n = len(history)
+
+        self.raw = (
+            RawArray(c_longlong, n),
+            RawArray(c_longlong, n),
+            RawArray(c_byte, n),
+            RawArray(c_byte, n)
+        )
+
+        for raw, column in zip(self.raw, history.columns()):
+            memoryview(raw).cast('B').cast(column.typecode)[:] = column
+
+    def __len__(self):
+        return len(self.raw[0])
+
+    def columns(self):
+        return tuple(memoryview(raw).cast('B').cast(typecode) for raw, typecode in zip(self.raw, 'qqbb'))
+
+
+def default_jobs():
+    """Returns the default jobs, one per period and one per mark."""
+    return [('period', p) for p in PERIODS_ABBR] + [('mark', MIN_NUMBER + j) for j in range(SIZE)]
+
+
+def run_job(columns, job, trials=1000, seed=0):
+    """Runs the job, a ('period', period) or ('mark', number) pair, on the given history columns.
+
+    A period job returns the chi-square, runs, serial correlation and Monte
+    Carlo statistics of the numbers drawn in the period. A mark job returns the
+    MarkSummary of the mark.
+    """
+    _, _, periods, numbers = columns
+    kind, key = job
+
+    if kind == 'period':
+        p = PERIODS_ABBR.index(key)
+        ns = [n for q, n in zip(periods, numbers) if q == p]
+
+        return [
+            chi_square(ns),
+            runs_test(ns),
+            serial_correlation(ns),
+            monte_carlo(ns, trials=trials, seed=seed, workers=1)
+        ]
+    elif kind == 'mark':
+        positions = [i for i, n in enumerate(numbers) if n == key]
+        gaps = [b - a for a, b in zip(positions, positions[1:])]
+
+        return MarkSummary(
+            key,
+            len(positions),
+            sum(gaps) / len(gaps) if gaps else 0.0,
+            max(gaps, default=0),
+            len(numbers) - 1 - positions[-1] if positions else len(numbers)
+        )
+    else:
+        raise ValueError('job must be a (period, ...) or (mark, ...) pair: {!r}'.format(job))
+
+
+def run(history, jobs=None, workers=None, trials=1000, seed=0):
+    """Runs the jobs, the default jobs if none are given, across up to workers processes.
+
+    The history is copied into shared memory once and every worker reads it
+    from there. Returns a dict from each job to its result.
+    """
+    jobs = default_jobs() if jobs is None else list(jobs)
+    shared = SharedHistory(history)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared, trials, seed)) as executor:
+        return dict(zip(jobs, executor.map(_run_in_worker, jobs)))
+
+
+def run_serial(history, jobs=None, trials=1000, seed=0):
+    """Runs the jobs one after the other in the current process. Returns the same as run."""
+    jobs = default_jobs() if jobs is None else list(jobs)
+    columns = history.columns()
+
+    return { job: run_job(columns, job, trials=trials, seed=seed) for job in jobs }
+
+
+def compare(history, jobs=None, workers=None, trials=1000, seed=0):
+    """Runs the jobs serially and in parallel, and returns the results along with the wall-clock Timing of each run.
+
+    Raises PlayWheError if the two runs disagree.
+    """
+    start = time.perf_counter()
+    serial = run_serial(history, jobs, trials=trials, seed=seed)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = run(history, jobs, workers=workers, trials=trials, seed=seed)
+    parallel_seconds = time.perf_counter() - start
+
+    mismatches = [job for job in serial if serial[job] != parallel.get(job)]
+
+    if mismatches:
+        raise PlayWheError('the serial and parallel runs disagree on jobs: {!r}'.format(mismatches))
+
+    speedup = serial_seconds / parallel_seconds if parallel_seconds else 0.0
+
+    return parallel, Timing(serial_seconds, parallel_seconds, speedup)
+
+
+_worker_args = None
+
+
+def _init_worker(shared, trials, seed):
+    global _worker_args
+    _worker_args = (shared.columns(), trials, seed)
+
+
+def _run_in_worker(job):
+    columns, trials, seed = _worker_args
+
+    return run_job(columns, job, trials=trials, seed=seed)
@@ -0,0 +1,94 @@
+import cProfile
+import io
+import pstats
+import time
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+# The Profiler that spans are recorded in, if any
+_active = None
+
+
+@contextmanager
+def span(name):
+    """Times the enclosed block as the stage with the given name.
+
+    The time is only recorded while a Profiler is active, otherwise it costs
+    next to nothing.
+    """
+    profiler = _active
+
+    if profiler is None:
+        yield
+    else:
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            profiler.record(name, time.perf_counter() - start)
+
+
+class Profiler:
+    """Runs the enclosed block under cProfile and records the wall-clock time spent in each stage.
+
+    The stages are the spans that the block passes through, for e.g. fetch,
+    parse, validate and insert. Spans in other processes, like the ones that
+    read CSV files in parallel, aren't recorded.
+
+    When path is given the cProfile stats are written to it, for use with
+    pstats or a viewer like snakeviz.
+    """
+
+    def __init__(self, path=None, top=20):
+        self.path = path
+        self.top = top
+
+        # The (calls, seconds) of each stage, in the order they were first seen
+        self.spans = OrderedDict()
+
+        self.profile = cProfile.Profile()
+        self.seconds = 0.0
+
+    def record(self, name, seconds):
+        calls, total = self.spans.get(name, (0, 0.0))
+        self.spans[name] = (calls + 1, total + seconds)
+
+    def __enter__(self):
+        global _active
+
+        self._previous = _active
+        _active = self
+
+        self._start = time.perf_counter()
+        self.profile.enable()
+
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+
+        self.profile.disable()
+        self.seconds += time.perf_counter() - self._start
+
+        _active = self._previous
+
+        if self.path is not None:
+            self.profile.dump_stats(self.path)
+
+    def summary(self):
+        """Returns a table of the time spent in each stage followed by the top hot spots."""
+        lines = ['{:<12} {:>8} {:>10} {:>7}'.format('Stage', 'Calls', 'Seconds', '%')]
+
+        for name, (calls, seconds) in self.spans.items():
+            percent = 100 * seconds / self.seconds if self.seconds else 0.0
+            lines.append('{:<12} {:>8} {:>10.3f} {:>6.1f}%'.format(name, calls, seconds, percent))
+
+        lines.append('{:<12} {:>8} {:>10.3f}'.format('total', '', self.seconds))
+
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(self.top)
+
+        return '\n'.join(lines) + '\n\n' + stream.getvalue().strip() + '\n'
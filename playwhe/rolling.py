@@ -0,0 +1,128 @@
+import datetime
+
+from array import array
+from bisect import bisect_left, bisect_right
+
+from .analytics import SIZE
+from .constants import MIN_NUMBER, PERIODS_ABBR
+from .history import History, result_key
+
+
+class RollingCounts:
+    """Per-mark counts over sliding windows of a history.
+
+    The counts are kept as prefix sums. prefix[i * SIZE + j] is the number of
+    times the number MIN_NUMBER + j was drawn in the first i results, so the
+    counts for any window are found in O(1) per mark. The same is kept for the
+    results of each period.
+
+    Use extend, for e.g. as a Store subscriber, to bring the counts up to date
+    with newly inserted results.
+    """
+
+    def __init__(self, history=None):
+        self._build(history)
+
+    def _build(self, history):
+        self.history = History()
+
+        self.prefix = array('l', [0] * SIZE)
+
+        self.period_days = [array('q') for _ in PERIODS_ABBR]
+        self.period_prefix = [array('l', [0] * SIZE) for _ in PERIODS_ABBR]
+
+        if history is not None:
+            for i in range(len(history)):
+                self.history.append_row(*_row(history, i))
+                self._count(history.days[i], history.periods[i], history.numbers[i])
+
+    def _count(self, day, period, number):
+        index = number - MIN_NUMBER
+
+        self.prefix.extend(self.prefix[-SIZE:])
+        self.prefix[index - SIZE] += 1
+
+        period_prefix = self.period_prefix[period]
+        period_prefix.extend(period_prefix[-SIZE:])
+        period_prefix[index - SIZE] += 1
+
+        self.period_days[period].append(day)
+
+    def __len__(self):
+        return len(self.history)
+
+    def extend(self, results):
+        """Counts the results that haven't been counted yet.
+
+        The results are expected to be in order. If any of them comes before
+        the last result counted, e.g. one inserted by --refetch or --repair,
+        the counts are built again from scratch. Returns the results that were
+        counted.
+        """
+        results = [result for result in results if result.is_valid()]
+        last_key = self.history.last_key()
+
+        if last_key is not None:
+            draws = set(self.history.draws)
+            older = [r for r in results if result_key(r) <= last_key and r.draw not in draws]
+
+            if older:
+                counted = sorted(older + [r for r in results if result_key(r) > last_key], key=result_key)
+                self._build(History.from_results([self.history.result(i) for i in range(len(self.history))] + counted))
+
+                return counted
+
+        appended = self.history.extend(results)
+
+        for result in appended:
+            self._count(result.date.toordinal(), PERIODS_ABBR.index(result.period), result.number)
+
+        return appended
+
+    def counts(self, start, end, period=None):
+        """Returns the counts, by number, for the results from index start up to but excluding end.
+
+        When a period is given the indices refer to the results of that period only.
+        """
+        prefix = self.prefix if period is None else self.period_prefix[PERIODS_ABBR.index(period)]
+
+        start *= SIZE
+        end *= SIZE
+
+        return { MIN_NUMBER + j: prefix[end + j] - prefix[start + j] for j in range(SIZE) }
+
+    def size(self, period=None):
+        """Returns the number of results counted, in total or for the given period."""
+        return len(self.history) if period is None else len(self.period_days[PERIODS_ABBR.index(period)])
+
+    def last_draws(self, n, period=None):
+        """Returns the counts, by number, for the last n draws, in total or of the given period."""
+        end = self.size(period)
+
+        return self.counts(max(end - n, 0), end, period)
+
+    def between(self, start_date, end_date, period=None):
+        """Returns the counts, by number, for the draws from start_date to end_date inclusive."""
+        days = self.history.days if period is None else self.period_days[PERIODS_ABBR.index(period)]
+
+        start = bisect_left(days, start_date.toordinal())
+        end = bisect_right(days, end_date.toordinal())
+
+        return self.counts(start, max(start, end), period)
+
+    def last_days(self, n, period=None, today=None):
+        """Returns the counts, by number, for the draws in the n days up to and including today.
+
+        today defaults to the date of the last result counted.
+        """
+        if today is None:
+            if not self.history.days:
+                return self.counts(0, 0)
+
+            today = datetime.date.fromordinal(self.history.days[-1])
+
+        return self.between(today - datetime.timedelta(days=n - 1), today, period)
+
+
+def _row(history, i):
+    return history.draws[i], history.days[i], history.periods[i], history.numbers[i]
@@ -0,0 +1,226 @@
+import math
+import random
+import statistics
+
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .analytics import SIZE
+from .constants import MIN_NUMBER, PERIODS_ABBR
+
+
+Statistic = namedtuple('Statistic', ['name', 'value', 'p_value'])
+
+
+# The number of simulated histories in each Monte Carlo task. It's fixed, and
+# not derived from the number of workers, so that results only depend on the seed.
+TRIALS_PER_TASK = 100
+
+
+def chi_square(numbers):
+    """Tests whether the numbers are uniformly distributed over MIN_NUMBER..MAX_NUMBER.
+
+    Returns the chi-square statistic and its p-value.
+    """
+    value = _chi_square_value(Counter(numbers), len(numbers))
+
+    return Statistic('chi-square', value, _chi_square_p_value(value, SIZE - 1))
+
+
+def _chi_square_value(counts, n):
+    if n == 0:
+        return 0.0
+
+    expected = n / SIZE
+
+    return sum((counts.get(number, 0) - expected) ** 2 for number in range(MIN_NUMBER, MIN_NUMBER + SIZE)) / expected
+
+
+def _chi_square_p_value(value, df):
+    return _gammq(df / 2, value / 2)
+
+
+def runs_test(numbers):
+    """Tests the numbers for independence with the Wald-Wolfowitz runs test above and below the median.
+
+    Numbers equal to the median are skipped. Returns the z statistic and its
+    two-sided p-value.
+    """
+    median = statistics.median(numbers) if numbers else 0
+    signs = [n > median for n in numbers if n != median]
+
+    above = sum(signs)
+    below = len(signs) - above
+
+    if above == 0 or below == 0:
+        return Statistic('runs', 0.0, 1.0)
+
+    runs = 1 + sum(1 for a, b in zip(signs, signs[1:]) if a != b)
+
+    n = above + below
+    mean = 2 * above * below / n + 1
+    variance = (mean - 1) * (mean - 2) / (n - 1)
+
+    z = (runs - mean) / math.sqrt(variance) if variance > 0 else 0.0
+
+    return Statistic('runs', z, math.erfc(abs(z) / math.sqrt(2)))
+
+
+def serial_correlation(numbers, lag=1):
+    """Tests the numbers for correlation with the numbers lag draws later.
+
+    Returns the correlation coefficient and its two-sided p-value.
+    """
+    n = len(numbers) - lag
+
+    if n < 2:
+        return Statistic('serial-correlation', 0.0, 1.0)
+
+    mean = sum(numbers) / len(numbers)
+    deviations = [x - mean for x in numbers]
+
+    variance = sum(d * d for d in deviations)
+    covariance = sum(a * b for a, b in zip(deviations, deviations[lag:]))
+
+    r = covariance / variance if variance else 0.0
+    z = r * math.sqrt(n)
+
+    return Statistic('serial-correlation', r, math.erfc(abs(z) / math.sqrt(2)))
+
+
+def monte_carlo(numbers, trials=1000, seed=0, workers=None):
+    """Compares the chi-square statistic of the numbers against simulated uniform draws.
+
+    trials histories with as many draws as there are numbers are simulated
+    across up to workers processes. Each task of TRIALS_PER_TASK trials is
+    seeded from seed and the task's index, so the result only depends on the
+    seed. Returns the observed statistic and the fraction of the simulated
+    statistics that are at least as large.
+    """
+    observed = _chi_square_value(Counter(numbers), len(numbers))
+
+    tasks = [
+        (seed, i, min(TRIALS_PER_TASK, trials - start), len(numbers))
+        for i, start in enumerate(range(0, trials, TRIALS_PER_TASK))
+    ]
+
+    if workers == 1 or len(tasks) <= 1:
+        simulated = list(map(simulate, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            simulated = list(executor.map(simulate, tasks))
+
+    extreme = sum(1 for values in simulated for value in values if value >= observed)
+
+    return Statistic('monte-carlo', observed, extreme / trials if trials else 1.0)
+
+
+def simulate(task):
+    """Returns the chi-square statistics of the simulated histories of the given (seed, index, trials, draws) task."""
+    seed, index, trials, draws = task
+
+    rng = random.Random('{}:{}'.format(seed, index))
+
+    return [_chi_square_value(_simulate_counts(rng, draws), draws) for _ in range(trials)]
+
+
+# Random bytes below _LIMIT map uniformly onto the marks, the rest are rejected
+_LIMIT = 256 - 256 % SIZE
+_TO_MARK = bytes(MIN_NUMBER + b % SIZE if b < _LIMIT else 0 for b in range(256))
+_REJECTED = bytes(range(_LIMIT, 256))
+
+
+def _simulate_counts(rng, draws):
+    """Returns the counts, by number, of draws uniformly random marks.
+
+    The marks are drawn a batch of random bytes at a time rather than one call
+    to the random number generator per draw.
+    """
+    sample = b''
+
+    while len(sample) < draws:
+        n = draws - len(sample)
+        batch = rng.getrandbits(8 * (n + n // 8 + 8)).to_bytes(n + n // 8 + 8, 'little')
+        sample += batch.translate(_TO_MARK, _REJECTED)
+
+    sample = sample[:draws]
+
+    return { number: sample.count(number) for number in range(MIN_NUMBER, MIN_NUMBER + SIZE) }
+
+
+def report(history, trials=1000, seed=0, workers=None):
+    """Runs every test on the numbers of each period, and on all the numbers, of the history.
+
+    Returns a dict from the period, or None for all the numbers, to the list of
+    Statistics.
+    """
+    numbers = { None: list(history.numbers) }
+
+    for i, period in enumerate(PERIODS_ABBR):
+        numbers[period] = [n for p, n in zip(history.periods, history.numbers) if p == i]
+
+    return {
+        period: [
+            chi_square(ns),
+            runs_test(ns),
+            serial_correlation(ns),
+            monte_carlo(ns, trials=trials, seed=seed, workers=workers)
+        ]
+        for period, ns in numbers.items()
+    }
+
+
+# The regularized upper incomplete gamma function, Q(a, x), follows Numerical
+# Recipes in C, section 6.2.
+
+_EPS = 1e-12
+_ITMAX = 1000
+
+
+def _gammq(a, x):
+    if x <= 0:
+        return 1.0
+    elif x < a + 1:
+        return 1.0 - _gser(a, x)
+    else:
+        return _gcf(a, x)
+
+
+def _gser(a, x):
+    ap = a
+    total = delta = 1.0 / a
+
+    for _ in range(_ITMAX):
+        ap += 1
+        delta *= x / ap
+        total += delta
+
+        if abs(delta) < abs(total) * _EPS:
+            break
+
+    return total * math.exp(-x + a * math.log(x) - math.lgamma(a))
+
+
+def _gcf(a, x):
+    tiny = 1e-300
+
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+
+    for i in range(1, _ITMAX + 1):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1) < _EPS:
+            break
+
+    return math.exp(-x + a * math.log(x) - math.lgamma(a)) * h
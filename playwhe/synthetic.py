@@ -0,0 +1,195 @@
+import argparse
+import csv
+import datetime
+import random
+import shutil
+import sys
+import tempfile
+
+from array import array
+
+from sqlalchemy import create_engine
+
+from .cli.store import Store, insert
+from .common import Result, Results, periods_on
+from .constants import MAX_NUMBER, MIN_NUMBER, PERIODS_ABBR, START_DATE
+from .history import MAGIC_NUMBER
+
+
+NUMBERS = range(MIN_NUMBER, MAX_NUMBER + 1)
+
+
+def generate(count=None, start_date=START_DATE, end_date=None, seed=0, first_draw=1):
+    """Yields the (draw, date, period, number) rows of a synthetic history in draw order.
+
+    The rows start on start_date with first_draw and stop after count rows or
+    after end_date, whichever comes first. At least one of count and end_date
+    must be given. The days follow the period schedule of each era, see
+    :func:`playwhe.common.periods_on`, and the numbers are drawn uniformly at
+    random from a generator seeded with seed, so the same arguments always
+    give the same history. The history can't go beyond datetime.date.max,
+    i.e. roughly 10 million draws.
+    """
+    if count is None and end_date is None:
+        raise ValueError('count or end_date must be given')
+
+    if count is not None and count < 0:
+        raise ValueError('count must be a non-negative integer: {!r}'.format(count))
+
+    rng = random.Random(seed)
+    choices = rng.choices
+
+    draw = first_draw
+    remaining = count
+    date = start_date
+    one_day = datetime.timedelta(days=1)
+
+    while remaining != 0 and (end_date is None or date <= end_date):
+        periods = periods_on(date)
+
+        if remaining is not None and len(periods) > remaining:
+            periods = periods[:remaining]
+
+        for period, number in zip(periods, choices(NUMBERS, k=len(periods))):
+            yield draw, date, period, number
+            draw += 1
+
+        if remaining is not None:
+            remaining -= len(periods)
+
+        if date == datetime.date.max:
+            break
+
+        date += one_day
+
+
+def write_csv(rows, csvfile):
+    """Writes the rows to the given text file in the format of data/results.csv. Returns the number of rows."""
+    writer = csv.writer(csvfile, lineterminator='\n')
+    n = 0
+
+    for draw, date, period, number in rows:
+        writer.writerow((draw, date.isoformat(), period, number))
+        n += 1
+
+    return n
+
+
+def write_history(rows, path, chunk_size=1 << 16):
+    """Writes the rows to the given path in the format of History.save. Returns the number of rows.
+
+    Each column is buffered in a temporary file, chunk_size rows at a time, so
+    memory use doesn't grow with the number of rows.
+    """
+    typecodes = ('q', 'q', 'b', 'b')
+    spools = [tempfile.TemporaryFile() for _ in typecodes]
+
+    try:
+        columns = [array(t) for t in typecodes]
+        period_index = { p: i for i, p in enumerate(PERIODS_ABBR) }
+        n = 0
+
+        for draw, date, period, number in rows:
+            columns[0].append(draw)
+            columns[1].append(date.toordinal())
+            columns[2].append(period_index[period])
+            columns[3].append(number)
+            n += 1
+
+            if len(columns[0]) == chunk_size:
+                for column, spool in zip(columns, spools):
+                    column.tofile(spool)
+                    del column[:]
+
+        for column, spool in zip(columns, spools):
+            column.tofile(spool)
+
+        with open(path, 'wb') as f:
+            f.write(MAGIC_NUMBER)
+            f.write(n.to_bytes(8, 'little'))
+
+            for spool in spools:
+                spool.seek(0)
+                shutil.copyfileobj(spool, f)
+    finally:
+        for spool in spools:
+            spool.close()
+
+    return n
+
+
+def write_store(rows, store, batch_size=10000):
+    """Inserts the rows into the given Store, batch_size rows per transaction. Returns the number of rows."""
+    n = 0
+    batch = []
+
+    for draw, date, period, number in rows:
+        batch.append(Result(draw, date.year, date.month, date.day, period, number))
+
+        if len(batch) == batch_size:
+            n += len(batch)
+            store.publish(insert(store.bind, Results(batch), store.layout))
+            batch = []
+
+    if batch:
+        n += len(batch)
+        store.publish(insert(store.bind, Results(batch), store.layout))
+
+    return n
+
+
+def date_type(s):
+    try:
+        return datetime.datetime.strptime(s, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError('must be YYYY-MM-DD: {!r}'.format(s))
+
+
+PARSER = argparse.ArgumentParser(
+    prog='playwhe-synthetic',
+    description='Generate a synthetic Play Whe history for scale testing.'
+)
+PARSER.add_argument('output', metavar='OUTPUT',
+    help='the CSV file, - for standard output, history file or database URL to write to'
+)
+PARSER.add_argument('-n', '--count', type=int,
+    help='the number of draws to generate'
+)
+PARSER.add_argument('--start', type=date_type, default=START_DATE, metavar='YYYY-MM-DD',
+    help='the date of the first draw (default: {})'.format(START_DATE)
+)
+PARSER.add_argument('--end', type=date_type, metavar='YYYY-MM-DD',
+    help='the date after which to stop'
+)
+PARSER.add_argument('--seed', type=int, default=0,
+    help='the seed of the random number generator (default: 0)'
+)
+PARSER.add_argument('-f', '--format', choices=['csv', 'history', 'db'], default='csv',
+    help='what to write, a CSV file, a history file (see playwhe.history) or an initialized database (default: csv)'
+)
+
+
+def main(args=None):
+    namespace = PARSER.parse_args(args)
+
+    if namespace.count is None and namespace.end is None:
+        PARSER.error('one of --count and --end is required')
+
+    rows = generate(namespace.count, namespace.start, namespace.end, namespace.seed)
+
+    if namespace.format == 'csv':
+        if namespace.output == '-':
+            write_csv(rows, sys.stdout)
+        else:
+            with open(namespace.output, 'w', newline='') as f:
+                write_csv(rows, f)
+    elif namespace.format == 'history':
+        write_history(rows, namespace.output)
+    else:
+        write_store(rows, Store(create_engine(namespace.output)))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,9 +3,13 @@ from setuptools import setup
 
 setup(
     install_requires=['requests', 'sqlalchemy'],
+    extras_require={
+        'zstd': ['zstandard>=0.15']
+    },
     entry_points={
         'console_scripts': [
-            'playwhe=playwhe.cli:main'
+            'playwhe=playwhe.cli:main',
+            'playwhe-synthetic=playwhe.synthetic:main'
         ]
     }
 )
@@ -0,0 +1,80 @@
+import datetime
+import unittest
+
+from playwhe.cli.cache import CachedStore, LRUCache
+from playwhe.cli.store import Store, insert
+from playwhe.common import Result, Results
+
+
+class LRUCacheTestCase(unittest.TestCase):
+    def test_it_evicts_the_least_recently_used_entry(self):
+        cache = LRUCache(maxsize=2)
+
+        cache.get('a', lambda: 1)
+        cache.get('b', lambda: 2)
+        cache.get('a', lambda: None)
+        cache.get('c', lambda: 3)
+
+        self.assertEqual(list(cache.entries), ['a', 'c'])
+        self.assertEqual(cache.stats(), { 'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2 })
+
+    def test_values_computed_across_a_clear_are_not_cached(self):
+        cache = LRUCache()
+
+        def compute():
+            cache.clear()
+            return 1
+
+        self.assertEqual(cache.get('a', compute), 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_maxsize_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+
+class CachedStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+        insert(self.store.bind, Results([
+            Result(1, 1994, 7, 4, 'AM', 15),
+            Result(2, 1994, 7, 4, 'PM', 7),
+            Result(3, 1994, 7, 5, 'AM', 15)
+        ]))
+
+        self.cached = CachedStore(self.store)
+
+    def tearDown(self):
+        self.cached.close()
+        self.store = None
+
+    def test_repeated_queries_are_cached(self):
+        self.assertEqual(self.cached.last_result().draw, 3)
+        self.assertEqual(self.cached.last_result().draw, 3)
+
+        self.assertEqual([r.draw for r in self.cached.last_appearances(15, 5)], [3, 1])
+        self.assertEqual([r.draw for r in self.cached.last_appearances(15, 5)], [3, 1])
+
+        self.assertEqual(self.cached.cache.hits, 2)
+        self.assertEqual(self.cached.cache.misses, 2)
+
+    def test_it_is_invalidated_by_inserts(self):
+        today = datetime.date(1994, 7, 5)
+
+        self.assertEqual([r.draw for r in self.cached.results(today, today)], [3])
+
+        self.store.refetch([(1994, 7)], fetch=lambda year, month: Results([Result(4, 1994, 7, 5, 'PM', 36)]))
+
+        self.assertEqual([r.draw for r in self.cached.results(today, today)], [3, 4])
+        self.assertEqual(self.cached.last_result().draw, 4)
+
+    def test_it_is_not_invalidated_when_nothing_is_inserted(self):
+        self.cached.last_result()
+
+        self.store.refetch([(1994, 7)], fetch=lambda year, month: Results([Result(3, 1994, 7, 5, 'AM', 15)]))
+
+        self.cached.last_result()
+
+        self.assertEqual(self.cached.cache.hits, 1)
@@ -0,0 +1,71 @@
+import datetime
+import unittest
+
+from playwhe.cli.store import Store, insert
+from playwhe.common import Result, Results
+
+
+class ChangesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+        self.published = []
+        self.store.subscribe(self.published.append)
+
+    def tearDown(self):
+        self.store = None
+
+    def test_insert_returns_only_the_new_results(self):
+        insert(self.store.bind, Results([
+            Result(1, 1994, 7, 4, 'AM', 15),
+            Result(2, 1994, 7, 4, 'PM', 7)
+        ]))
+
+        inserted = insert(self.store.bind, Results([
+            Result(2, 1994, 7, 4, 'PM', 7),
+            Result(3, 1994, 7, 5, 'AM', 36),
+            Result(3, 1994, 7, 5, 'AM', 36)
+        ]))
+
+        self.assertEqual([r.draw for r in inserted], [3])
+
+    def test_changes_since(self):
+        self.store.update(fetch=FakeFetch({
+            (1994, 7): [Result(1, 1994, 7, 4, 'AM', 15), Result(2, 1994, 7, 4, 'PM', 7)]
+        }), today=lambda: datetime.date(1994, 7, 31))
+
+        self.assertEqual([(c.seq, c.draw) for c in self.store.changes()], [(1, 1), (2, 2)])
+        self.assertEqual(self.store.last_seq(), 2)
+
+        since = self.store.last_seq()
+
+        self.store.update(fetch=FakeFetch({
+            (1994, 7): [Result(1, 1994, 7, 4, 'AM', 15), Result(2, 1994, 7, 4, 'PM', 7), Result(3, 1994, 7, 5, 'AM', 36)]
+        }), today=lambda: datetime.date(1994, 7, 31))
+
+        changes = self.store.changes(since)
+
+        self.assertEqual([(c.seq, c.draw, c.date, c.period_abbr, c.mark_number) for c in changes], [
+            (3, 3, datetime.date(1994, 7, 5), 'AM', 36)
+        ])
+        self.assertEqual(self.store.changes(since=3), [])
+        self.assertEqual(len(self.store.changes(limit=1)), 1)
+
+    def test_subscribers_only_get_the_new_results(self):
+        self.store.refetch([(1994, 7)], fetch=FakeFetch({
+            (1994, 7): [Result(1, 1994, 7, 4, 'AM', 15)]
+        }))
+        self.store.refetch([(1994, 7)], fetch=FakeFetch({
+            (1994, 7): [Result(1, 1994, 7, 4, 'AM', 15), Result(2, 1994, 7, 4, 'PM', 7)]
+        }))
+
+        self.assertEqual([[r.draw for r in results] for results in self.published], [[1], [2]])
+
+
+class FakeFetch:
+    def __init__(self, months):
+        self.months = months
+
+    def __call__(self, year, month, after=None):
+        return Results(r for r in self.months.get((year, month), []) if after is None or r.draw > after)
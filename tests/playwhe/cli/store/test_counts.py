@@ -0,0 +1,55 @@
+import datetime
+import unittest
+
+from playwhe.cli.store import Store, insert, schema
+from playwhe.common import Result, Results
+
+
+class CountsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+        insert(self.store.bind, Results([
+            Result(1, 1994, 7, 4, 'AM', 15),
+            Result(2, 1994, 7, 4, 'PM', 15),
+            Result(3, 1994, 7, 5, 'AM', 15),
+            Result(4, 1994, 8, 1, 'AM', 36)
+        ]))
+
+    def tearDown(self):
+        self.store = None
+
+    def test_daily_counts(self):
+        rows = self.store.daily_counts(datetime.date(1994, 7, 4), datetime.date(1994, 7, 31))
+
+        self.assertEqual(rows, [
+            (datetime.date(1994, 7, 4), 'AM', 15, 1),
+            (datetime.date(1994, 7, 4), 'PM', 15, 1),
+            (datetime.date(1994, 7, 5), 'AM', 15, 1)
+        ])
+
+    def test_monthly_counts(self):
+        rows = self.store.monthly_counts((1994, 7), (1994, 8))
+
+        self.assertEqual(rows, [
+            (1994, 7, 'AM', 15, 2),
+            (1994, 7, 'PM', 15, 1),
+            (1994, 8, 'AM', 36, 1)
+        ])
+
+        self.assertEqual(self.store.monthly_counts((1994, 7), (1994, 7), period='PM'), [(1994, 7, 'PM', 15, 1)])
+
+    def test_duplicates_are_not_counted_twice(self):
+        insert(self.store.bind, Results([
+            Result(3, 1994, 7, 5, 'AM', 15),
+            Result(5, 1994, 7, 6, 'AM', 15)
+        ]))
+
+        self.assertEqual(self.store.monthly_counts((1994, 7), (1994, 7), period='AM'), [(1994, 7, 'AM', 15, 3)])
+
+    def test_initialize_rebuilds_the_counts(self):
+        self.store.bind.execute(schema.monthly_counts.delete())
+        self.store.initialize()
+
+        self.assertEqual(len(self.store.monthly_counts((1994, 7), (1994, 8))), 3)
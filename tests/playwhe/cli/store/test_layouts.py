@@ -0,0 +1,108 @@
+import datetime
+import unittest
+
+from sqlalchemy import func, inspect, select
+
+from playwhe.cli.layouts import ByYear, SingleTable, detect
+from playwhe.cli.store import Store, insert, schema
+from playwhe.cli.verify import MISSING_PERIODS
+from playwhe.common import Result, Results
+
+
+RESULTS = Results([
+    Result(1, 1994, 12, 30, 'AM', 15),
+    Result(2, 1994, 12, 30, 'PM', 7),
+    Result(3, 1995, 1, 2, 'AM', 36),
+    Result(4, 1996, 3, 4, 'PM', 15)
+])
+
+
+class SingleTableTestCase(unittest.TestCase):
+    def test_it_uses_the_results_table(self):
+        store = Store()
+        store.initialize()
+
+        with store.bind.connect() as conn:
+            self.assertEqual(SingleTable().tables(conn), [schema.results])
+            self.assertIs(SingleTable().table_for(conn, 1994), schema.results)
+
+
+class ByYearTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store(layout=ByYear())
+        self.store.initialize()
+        insert(self.store.bind, RESULTS, self.store.layout)
+
+    def tearDown(self):
+        self.store = None
+
+    def test_it_creates_a_table_per_year(self):
+        names = inspect(self.store.bind).get_table_names()
+
+        self.assertIn('results_1994', names)
+        self.assertIn('results_1995', names)
+        self.assertIn('results_1996', names)
+        self.assertEqual(self.store.bind.execute(select([func.count()]).select_from(schema.results)).scalar(), 0)
+
+    def test_results_only_reads_the_years_in_the_range(self):
+        with self.store.bind.connect() as conn:
+            tables = self.store.layout.tables(conn, datetime.date(1995, 1, 1), datetime.date(1995, 12, 31))
+
+        self.assertEqual([t.name for t in tables], ['results_1995'])
+
+        draws = [r.draw for r in self.store.results(datetime.date(1994, 12, 30), datetime.date(1995, 1, 31))]
+
+        self.assertEqual(draws, [1, 2, 3])
+
+    def test_last_result(self):
+        self.assertEqual(self.store.last_result().draw, 4)
+
+    def test_counts(self):
+        rows = self.store.monthly_counts((1994, 12), (1996, 3), period='AM')
+
+        self.assertEqual(rows, [
+            (1994, 12, 'AM', 15, 1),
+            (1995, 1, 'AM', 36, 1)
+        ])
+
+    def test_it_finds_existing_tables(self):
+        store = Store(self.store.bind, layout=ByYear())
+
+        self.assertEqual(store.last_result().draw, 4)
+
+    def test_verify_reads_across_the_tables(self):
+        problems = list(self.store.verify(today=lambda: datetime.date(1996, 3, 4)))
+
+        self.assertEqual([(p.kind, p.start_date) for p in problems], [
+            (MISSING_PERIODS, datetime.date(1995, 1, 2))
+        ])
+
+
+class DetectTestCase(unittest.TestCase):
+    def test_a_new_database(self):
+        store = Store()
+        store.initialize()
+
+        self.assertIsNone(detect(store.bind))
+
+    def test_an_unpartitioned_database(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, RESULTS, store.layout)
+
+        self.assertIsInstance(detect(store.bind), SingleTable)
+        self.assertNotIsInstance(detect(store.bind), ByYear)
+
+    def test_a_partitioned_database_without_results(self):
+        store = Store(layout=ByYear())
+        store.initialize()
+
+        self.assertIsInstance(detect(store.bind), ByYear)
+
+    def test_a_partitioned_database_without_the_setting(self):
+        store = Store(layout=ByYear())
+        store.initialize()
+        insert(store.bind, RESULTS, store.layout)
+        store.bind.execute(schema.settings.delete())
+
+        self.assertIsInstance(detect(store.bind), ByYear)
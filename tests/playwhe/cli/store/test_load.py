@@ -1,5 +1,8 @@
 import datetime
+import gzip
 import io
+import os
+import tempfile
 import unittest
 
 from sqlalchemy import select
@@ -26,3 +29,102 @@ class LoadTestCase(unittest.TestCase):
         self.assertEqual(data[1], (2, datetime.date(1994, 7, 4), 'PM', 11))
         self.assertEqual(data[2], (3, datetime.date(1994, 7, 5), 'AM', 36))
         self.assertEqual(data[3], (4, datetime.date(1994, 7, 5), 'PM', 31))
+
+    def test_it_writes_rejects(self):
+        csvfile = io.StringIO('1,1994-07-04,AM,15\nbad\n2,1994-07-04,XM,11')
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            rejects = os.path.join(tmpdir, 'rejects.csv')
+
+            with self.assertLogs('playwhe.cli.store', level='ERROR'):
+                self.store.load(csvfile, rejects=rejects)
+
+            with open(rejects) as f:
+                self.assertEqual(f.read(), 'bad\n2,1994-07-04,XM,11\n')
+
+
+class LoadFilesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        self.store = None
+
+    def write(self, name, contents):
+        path = os.path.join(self.tmpdir.name, name)
+
+        with open(path, 'w') as f:
+            f.write(contents)
+
+        return path
+
+    def test_it_merges_results_from_all_files(self):
+        paths = [
+            self.write('1994.csv', '3,1994-07-05,AM,36\n1,1994-07-04,AM,15\n'),
+            self.write('1995.csv', '4,1994-07-05,PM,31\nbad\n2,1994-07-04,PM,11\n')
+        ]
+
+        with self.assertLogs('playwhe.cli.store', level='ERROR'):
+            self.store.load_files(paths, workers=2)
+
+        data = self.store.bind.execute(select([schema.results]).order_by(schema.results.c.draw)).fetchall()
+
+        self.assertEqual(data, [
+            (1, datetime.date(1994, 7, 4), 'AM', 15),
+            (2, datetime.date(1994, 7, 4), 'PM', 11),
+            (3, datetime.date(1994, 7, 5), 'AM', 36),
+            (4, datetime.date(1994, 7, 5), 'PM', 31)
+        ])
+
+    def test_it_writes_rejects_in_the_order_of_the_files(self):
+        paths = [
+            self.write('1994.csv', '1,1994-07-04,AM,15\nbad 1\n'),
+            self.write('1995.csv', 'bad 2\n2,1994-07-04,PM,11\nbad 3\n')
+        ]
+        rejects = os.path.join(self.tmpdir.name, 'rejects.csv')
+
+        with self.assertLogs('playwhe.cli.store', level='ERROR'):
+            self.store.load_files(paths, workers=2, rejects=rejects)
+
+        with open(rejects) as f:
+            self.assertEqual(f.read(), 'bad 1\nbad 2\nbad 3\n')
+
+        data = self.store.bind.execute(select([schema.results])).fetchall()
+
+        self.assertEqual(len(data), 2)
+
+    def test_it_reports_the_errors_of_all_files_at_once(self):
+        paths = [
+            self.write('1994.csv', 'bad 1\nbad 2\n'),
+            self.write('1995.csv', 'bad 3\n')
+        ]
+
+        with self.assertLogs('playwhe.cli.store', level='ERROR') as logs:
+            self.store.load_files(paths, workers=2)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertTrue(logs.records[0].getMessage().endswith('Total errors = 3'))
+
+    def test_when_one_file(self):
+        path = self.write('1994.csv', '1,1994-07-04,AM,15\n2,1994-07-04,PM,11\n')
+
+        self.store.load_files([path], batch_size=1)
+
+        data = self.store.bind.execute(select([schema.results]).order_by(schema.results.c.draw)).fetchall()
+
+        self.assertEqual(len(data), 2)
+
+    def test_when_compressed_file(self):
+        path = os.path.join(self.tmpdir.name, '1994.csv.gz')
+
+        with gzip.open(path, 'wt') as f:
+            f.write('1,1994-07-04,AM,15\n2,1994-07-04,PM,11\n')
+
+        self.store.load(path)
+
+        data = self.store.bind.execute(select([schema.results]).order_by(schema.results.c.draw)).fetchall()
+
+        self.assertEqual(len(data), 2)
@@ -0,0 +1,109 @@
+import datetime
+import unittest
+
+from collections import namedtuple
+
+from sqlalchemy import select
+
+from playwhe.cli.store import Conflict, Store, insert, merge, schema
+from playwhe.common import Result, Results
+
+
+Row = namedtuple('Row', ['draw', 'date', 'period_abbr', 'mark_number'])
+
+
+class MergeTestCase(unittest.TestCase):
+    def test_it_keeps_the_new_results(self):
+        stored = [
+            Row(2, datetime.date(1994, 7, 4), 'PM', 7),
+            Row(4, datetime.date(1994, 7, 5), 'PM', 9)
+        ]
+        results = [
+            Result(1, 1994, 7, 4, 'AM', 15),
+            Result(2, 1994, 7, 4, 'PM', 7),
+            Result(3, 1994, 7, 5, 'AM', 36),
+            Result(3, 1994, 7, 5, 'AM', 36),
+            Result(4, 1994, 7, 5, 'PM', 9),
+            Result(5, 1994, 7, 6, 'AM', 1)
+        ]
+
+        new, conflicts = merge(stored, results)
+
+        self.assertEqual([r.draw for r in new], [1, 3, 5])
+        self.assertEqual(conflicts, [])
+
+    def test_it_flags_conflicts(self):
+        stored = [Row(2, datetime.date(1994, 7, 4), 'PM', 7)]
+        fetched = Result(2, 1994, 7, 4, 'PM', 8)
+
+        new, conflicts = merge(stored, [fetched])
+
+        self.assertEqual(new, [])
+        self.assertEqual(conflicts, [Conflict(stored[0], fetched)])
+
+
+class InsertConflictsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+        insert(self.store.bind, Results([
+            Result(1, 1994, 7, 4, 'AM', 15),
+            Result(2, 1994, 7, 4, 'PM', 7)
+        ]))
+
+    def tearDown(self):
+        self.store = None
+
+    def test_refetch_flags_conflicts_and_keeps_the_stored_rows(self):
+        with self.assertLogs('playwhe.cli.store', 'WARNING'):
+            self.store.refetch([(1994, 7)], fetch=lambda year, month: Results([
+                Result(1, 1994, 7, 4, 'AM', 15),
+                Result(2, 1994, 7, 4, 'PM', 8),
+                Result(3, 1994, 7, 5, 'AM', 36)
+            ]))
+
+        self.assertEqual([c.fetched.draw for c in self.store.conflicts], [2])
+        self.assertEqual([(r.draw, r.mark_number) for r in self.store.results()], [(1, 15), (2, 7), (3, 36)])
+
+    def test_update_flags_conflicts(self):
+        def fetch(year, month, after=None):
+            return Results([
+                Result(2, 1994, 7, 4, 'PM', 8),
+                Result(3, 1994, 7, 5, 'AM', 36)
+            ])
+
+        with self.assertLogs('playwhe.cli.store', 'WARNING'):
+            self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 7, 31))
+
+        self.assertEqual([c.fetched.draw for c in self.store.conflicts], [2])
+        self.assertEqual(self.store.last_result().draw, 3)
+
+    def test_update_flags_draws_stored_under_an_earlier_date(self):
+        self.store.bind.execute(schema.results.insert(), [
+            { 'draw': 4, 'date': datetime.date(1994, 7, 30), 'period_abbr': 'PM', 'mark_number': 1 },
+            { 'draw': 3, 'date': datetime.date(1994, 8, 1), 'period_abbr': 'AM', 'mark_number': 2 }
+        ])
+
+        def fetch(year, month, after=None):
+            return Results([Result(4, 1994, 8, 1, 'PM', 3)] if (year, month) == (1994, 8) else [])
+
+        with self.assertLogs('playwhe.cli.store', 'WARNING'):
+            self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 8, 31))
+
+        self.assertEqual([c.fetched.draw for c in self.store.conflicts], [4])
+        self.assertEqual(self.store.bind.execute(select([schema.results.c.date]).where(schema.results.c.draw == 4)).scalar(), datetime.date(1994, 7, 30))
+
+    def test_insert_ignores_draws_missing_from_stored(self):
+        conflicts = []
+
+        with self.assertLogs('playwhe.cli.store', 'WARNING'):
+            inserted = insert(self.store.bind, Results([
+                Result(2, 1994, 7, 4, 'PM', 8),
+                Result(3, 1994, 7, 5, 'AM', 36)
+            ]), stored=[], conflicts=conflicts)
+
+        self.assertEqual([r.draw for r in inserted], [3])
+        self.assertEqual([c.fetched.draw for c in conflicts], [2])
+        self.assertEqual([(r.draw, r.mark_number) for r in self.store.results()], [(1, 15), (2, 7), (3, 36)])
+        self.assertEqual([row.draw for row in self.store.changes()], [1, 2, 3])
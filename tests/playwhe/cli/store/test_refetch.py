@@ -0,0 +1,83 @@
+import datetime
+import unittest
+
+from sqlalchemy import select
+
+from playwhe.cli.store import Store, schema
+from playwhe.common import Result, Results
+
+
+FAKE_SERVER_RESULTS = {
+    (1994, 7): [
+        Result(1, 1994, 7, 4, 'AM', 36),
+        Result(2, 1994, 7, 4, 'PM', 35)
+    ],
+    (1994, 8): [
+        Result(3, 1994, 8, 1, 'AM', 32),
+        Result(4, 1994, 8, 1, 'PM', 31)
+    ],
+    (1994, 9): [
+        Result(5, 1994, 9, 1, 'AM', 30),
+        Result(6, 1994, 9, 1, 'PM', 29)
+    ]
+}
+
+
+class RefetchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+        self.fetched = []
+
+    def tearDown(self):
+        self.store = None
+
+    def fake_fetch(self, year, month):
+        self.fetched.append((year, month))
+
+        return Results(FAKE_SERVER_RESULTS.get((year, month), []))
+
+    def draws(self):
+        return [row.draw for row in self.store.bind.execute(select([schema.results]).order_by(schema.results.c.draw))]
+
+    def test_it_only_fetches_the_given_months(self):
+        self.store.refetch([(1994, 9), (1994, 7), (1994, 9)], fetch=self.fake_fetch, workers=2)
+
+        self.assertEqual(sorted(self.fetched), [(1994, 7), (1994, 9)])
+        self.assertEqual(self.draws(), [1, 2, 5, 6])
+
+    def test_it_ignores_stored_results(self):
+        self.store.bind.execute(
+            schema.results.insert(),
+            [{ 'draw': 3, 'date': datetime.date(1994, 8, 1), 'period_abbr': 'AM', 'mark_number': 1 }]
+        )
+
+        self.store.refetch([(1994, 8)], fetch=self.fake_fetch)
+
+        data = self.store.bind.execute(select([schema.results]).order_by(schema.results.c.draw)).fetchall()
+
+        self.assertEqual(data, [
+            (3, datetime.date(1994, 8, 1), 'AM', 1),
+            (4, datetime.date(1994, 8, 1), 'PM', 31)
+        ])
+
+
+class DrawMonthsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+        self.store.bind.execute(schema.results.insert(), [
+            { 'draw': 1, 'date': datetime.date(1994, 7, 4), 'period_abbr': 'AM', 'mark_number': 1 },
+            { 'draw': 10, 'date': datetime.date(1994, 9, 1), 'period_abbr': 'AM', 'mark_number': 1 }
+        ])
+
+    def tearDown(self):
+        self.store = None
+
+    def test_it_bounds_the_months_by_the_closest_stored_draws(self):
+        self.assertEqual(self.store.draw_months(2, 9), [(1994, 7), (1994, 8), (1994, 9)])
+
+    def test_when_there_are_no_closest_stored_draws(self):
+        months = self.store.draw_months(11, 20, today=lambda: datetime.date(1994, 10, 10))
+
+        self.assertEqual(months, [(1994, 9), (1994, 10)])
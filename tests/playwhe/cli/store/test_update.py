@@ -1,10 +1,17 @@
 import datetime
+import functools
 import unittest
 
+from unittest.mock import Mock
+
 from sqlalchemy import select
 
-from playwhe.cli.store import Store, schema
-from playwhe.common import Result, Results
+from playwhe import client
+from playwhe.cli.store import Store, insert, schema
+from playwhe.common import MONTH_DRAWS, Params, Result, Results, periods_on
+from playwhe.synthetic import generate
+
+from ...client import fake
 
 
 FAKE_SERVER_RESULTS = {
@@ -65,3 +72,177 @@ class SyncTestCase(unittest.TestCase):
         self.assertEqual(data[0].draw, 1)
         self.assertEqual(data[1].draw, 5)
         self.assertEqual(data[2].draw, 6)
+
+    def test_it_only_asks_for_newer_results_in_the_resume_month(self):
+        self.store.bind.execute(
+            schema.results.insert(),
+            [{ 'draw': 2, 'date': datetime.date(1994, 7, 4), 'period_abbr': 'PM', 'mark_number': 35 }]
+        )
+
+        calls = []
+
+        def fetch(year, month, **kwargs):
+            calls.append((year, month, kwargs))
+            after = kwargs.get('after')
+            return Results(r for r in fake_fetch(year, month) if after is None or r.draw > after)
+
+        self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 8, 31))
+
+        self.assertEqual(calls, [(1994, 7, { 'after': 2 }), (1994, 8, {})])
+
+        data = self.store.bind.execute(select([schema.results.c.draw]).order_by(schema.results.c.draw)).fetchall()
+
+        self.assertEqual([row.draw for row in data], [2, 3, 4, 5, 6])
+
+
+def full_months(start_date, end_date, holidays=()):
+    """Returns the results of every scheduled draw from start_date to end_date, except on holidays, by (year, month)."""
+    months = {}
+    rows = [row for row in generate(start_date=start_date, end_date=end_date) if row[1] not in holidays]
+
+    for draw, (_, date, period, number) in enumerate(rows, start=1):
+        months.setdefault((date.year, date.month), []).append(Result(draw, date.year, date.month, date.day, period, number))
+
+    return months
+
+
+class CheckpointTestCase(unittest.TestCase):
+    SERVER_RESULTS = full_months(datetime.date(1994, 7, 4), datetime.date(1994, 9, 9))
+
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+        self.calls = []
+
+    def tearDown(self):
+        self.store = None
+
+    def fetch(self, year, month, after=None):
+        self.calls.append((year, month))
+
+        return Results(r for r in self.SERVER_RESULTS.get((year, month), []) if after is None or r.draw > after)
+
+    def checkpoints(self):
+        table = self.store.layout.checkpoints
+
+        return { (row.year, row.month): row.draws for row in self.store.bind.execute(select([table])) }
+
+    def test_it_checkpoints_the_months_that_are_over(self):
+        self.store.update(fetch=self.fetch, today=lambda: datetime.date(1994, 8, 31))
+
+        self.assertEqual(self.checkpoints(), { (1994, 7): MONTH_DRAWS[(1994, 7)] })
+
+    def test_it_skips_the_checkpointed_months_when_resuming(self):
+        self.store.update(fetch=self.fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        self.calls = []
+        self.store.update(fetch=self.fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        self.assertEqual(self.calls, [(1994, 9)])
+
+    def test_it_keeps_the_months_it_finished_when_interrupted(self):
+        def fetch(year, month, **kwargs):
+            if (year, month) == (1994, 8):
+                raise RuntimeError('connection lost')
+
+            return self.fetch(year, month, **kwargs)
+
+        with self.assertRaises(RuntimeError):
+            self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        # July is only known to be complete once August's first draw is stored
+        self.assertEqual(self.store.checkpoints(), set())
+        self.assertEqual(self.store.last_result().draw, self.SERVER_RESULTS[(1994, 7)][-1].draw)
+
+        self.calls = []
+        self.store.update(fetch=self.fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        self.assertEqual(self.calls, [(1994, 7), (1994, 8), (1994, 9)])
+        self.assertEqual(self.store.checkpoints(), {(1994, 7), (1994, 8)})
+        self.assertEqual(self.store.last_result().draw, self.SERVER_RESULTS[(1994, 9)][-1].draw)
+
+    def test_it_does_not_checkpoint_months_with_missing_draws(self):
+        def fetch(year, month, after=None):
+            results = self.fetch(year, month, after=after)
+
+            # The page was cut off
+            return Results(results[:10]) if (year, month) == (1994, 7) else results
+
+        self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        self.assertEqual(set(self.checkpoints()), {(1994, 8)})
+
+    def test_it_checkpoints_months_with_holidays(self):
+        holiday = datetime.date(1994, 8, 31)
+        self.SERVER_RESULTS = full_months(datetime.date(1994, 7, 4), datetime.date(1994, 9, 9), holidays={holiday})
+
+        self.store.update(fetch=self.fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        self.assertEqual(self.checkpoints(), {
+            (1994, 7): MONTH_DRAWS[(1994, 7)],
+            (1994, 8): MONTH_DRAWS[(1994, 8)] - len(periods_on(holiday))
+        })
+
+    def test_it_does_not_checkpoint_partly_published_months(self):
+        def fetch(year, month, after=None):
+            # The last day of August isn't published yet, and so neither is September
+            if (year, month) == (1994, 9):
+                return Results([])
+
+            return Results(r for r in self.fetch(year, month, after=after) if r.date < datetime.date(1994, 8, 31))
+
+        self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 9, 10))
+
+        self.assertEqual(set(self.checkpoints()), {(1994, 7)})
+
+    def test_it_checkpoints_the_resume_month_with_its_total(self):
+        insert(self.store.bind, Results(self.SERVER_RESULTS[(1994, 7)][:10]))
+
+        self.store.update(fetch=self.fetch, today=lambda: datetime.date(1994, 8, 31))
+
+        self.assertEqual(self.checkpoints(), { (1994, 7): MONTH_DRAWS[(1994, 7)] })
+
+
+class PageCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+        self.params = Params(1994, 7)
+        self.post = Mock(name='post')
+        self.post.return_value = Mock(name='response', status_code=200, text=fake.response(self.params), headers={})
+
+    def tearDown(self):
+        self.store = None
+
+    def test_it_records_pages_once_their_results_are_stored(self):
+        cache = client.PageCache()
+
+        self.store.update(
+            fetch=functools.partial(client.fetch, post=self.post, cache=cache),
+            today=lambda: datetime.date(1994, 7, 31),
+            on_commit=functools.partial(client.record_page, cache)
+        )
+
+        self.assertEqual(self.store.last_result().draw, 48)
+        self.assertIn('digest', cache.get(self.params))
+
+    def test_it_does_not_record_pages_when_interrupted(self):
+        cache = client.PageCache()
+
+        def fetch(year, month, **kwargs):
+            client.fetch(year, month, post=self.post, cache=cache, **kwargs)
+            raise KeyboardInterrupt
+
+        self.store.update(fetch=fetch, today=lambda: datetime.date(1994, 7, 31), on_commit=functools.partial(client.record_page, cache))
+
+        self.assertEqual(cache.get(self.params), {})
+
+        self.store.update(
+            fetch=functools.partial(client.fetch, post=self.post, cache=cache),
+            today=lambda: datetime.date(1994, 7, 31),
+            on_commit=functools.partial(client.record_page, cache)
+        )
+
+        self.assertEqual(self.store.last_result().draw, 48)
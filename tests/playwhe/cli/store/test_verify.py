@@ -0,0 +1,99 @@
+import datetime
+import unittest
+
+from playwhe.cli.store import Store, schema
+from playwhe.cli.verify import \
+    DUPLICATE_PERIOD, MISSING_DRAWS, MISSING_PERIODS, OUT_OF_ORDER, OUT_OF_SCHEDULE, \
+    Problem, problem_months
+from playwhe.games import Game
+
+
+TODAY = lambda: datetime.date(2020, 1, 1)
+
+
+class VerifyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.store = Store()
+        self.store.initialize()
+
+    def tearDown(self):
+        self.store = None
+
+    def insert(self, rows):
+        self.store.bind.execute(schema.results.insert(), [
+            { 'draw': draw, 'date': date, 'period_abbr': period, 'mark_number': 1 } for draw, date, period in rows
+        ])
+
+    def test_when_consistent(self):
+        self.insert([
+            (1, datetime.date(1994, 7, 4), 'AM'),
+            (2, datetime.date(1994, 7, 4), 'PM'),
+            (3, datetime.date(2011, 11, 21), 'EM'),
+            (4, datetime.date(2011, 11, 21), 'AM'),
+            (5, datetime.date(2011, 11, 21), 'PM'),
+            (6, datetime.date(2015, 7, 6), 'EM'),
+            (7, datetime.date(2015, 7, 6), 'AM'),
+            (8, datetime.date(2015, 7, 6), 'AN'),
+            (9, datetime.date(2015, 7, 6), 'PM')
+        ])
+
+        self.assertEqual(list(self.store.verify(today=TODAY)), [])
+
+    def test_when_no_results(self):
+        self.assertEqual(list(self.store.verify(today=TODAY)), [])
+
+    def test_it_finds_problems(self):
+        self.insert([
+            (1, datetime.date(1994, 7, 4), 'AM'),
+            (2, datetime.date(1994, 7, 4), 'PM'),
+            (5, datetime.date(1994, 8, 1), 'AM'),
+            (6, datetime.date(1994, 8, 1), 'AM'),
+            (7, datetime.date(1994, 8, 2), 'AM'),
+            (8, datetime.date(1994, 8, 2), 'AN'),
+            (9, datetime.date(1994, 8, 2), 'PM'),
+            (10, datetime.date(1994, 7, 29), 'AM')
+        ])
+
+        problems = [(p.kind, p.draw) for p in self.store.verify(today=TODAY)]
+
+        self.assertEqual(problems, [
+            (MISSING_DRAWS, 3),
+            (DUPLICATE_PERIOD, 6),
+            (MISSING_PERIODS, 6),
+            (OUT_OF_SCHEDULE, 8),
+            (OUT_OF_ORDER, 10),
+            (MISSING_PERIODS, 10)
+        ])
+
+    def test_it_checks_against_the_given_schedule(self):
+        game = Game('evenings', 1, 10, ('PM',), '', 'http://example.com', start_date=datetime.date(2015, 7, 6))
+
+        self.insert([
+            (1, datetime.date(2015, 7, 6), 'PM'),
+            (2, datetime.date(2015, 7, 7), 'AM'),
+            (3, datetime.date(2015, 7, 8), 'PM')
+        ])
+
+        problems = [(p.kind, p.draw) for p in self.store.verify(today=TODAY, periods_on=game.periods_on)]
+
+        self.assertEqual(problems, [
+            (OUT_OF_SCHEDULE, 2),
+            (MISSING_PERIODS, 2)
+        ])
+
+    def test_it_does_not_check_today_for_missing_periods(self):
+        self.insert([
+            (1, datetime.date(2019, 12, 31), 'EM'),
+            (2, datetime.date(2020, 1, 1), 'EM')
+        ])
+
+        problems = [(p.kind, p.start_date) for p in self.store.verify(today=TODAY)]
+
+        self.assertEqual(problems, [(MISSING_PERIODS, datetime.date(2019, 12, 31))])
+
+
+class ProblemMonthsTestCase(unittest.TestCase):
+    def test_it_returns_months_spanned(self):
+        problem = Problem(MISSING_DRAWS, 1, datetime.date(1999, 11, 30), datetime.date(2000, 2, 1), '')
+
+        self.assertEqual(problem_months(problem), [(1999, 11), (1999, 12), (2000, 1), (2000, 2)])
@@ -0,0 +1,67 @@
+"""Measures how long parser.parse takes on the corpus.
+
+Run it from the root of the repository:
+
+    $ python -m tests.playwhe.client.benchmark
+"""
+
+import argparse
+import time
+
+from playwhe.client.parser import parse
+from playwhe.common import Params
+
+from . import corpus
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def timed(html, params, repeat):
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(html, params)
+        seconds = time.perf_counter() - start
+
+        best = seconds if best is None else min(best, seconds)
+
+    return best
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Benchmark the Play Whe HTML parser.')
+    parser.add_argument('--repeat', type=int, default=3, help='the number of times to parse each page (default: 3)')
+    parser.add_argument('--size', type=int, default=200000, help='the size of the adversarial pages (default: 200000)')
+    namespace = parser.parse_args(args)
+
+    latencies = []
+    results = 0
+    characters = 0
+
+    for params, rows, html in corpus.month_pages():
+        latencies.append(timed(html, params, namespace.repeat))
+        results += len(rows)
+        characters += len(html)
+
+    total = sum(latencies)
+
+    print('Month pages: {}, results: {}, characters: {}'.format(len(latencies), results, characters))
+    print('Latency (ms): p50={:.3f} p90={:.3f} p99={:.3f} max={:.3f}'.format(
+        *(1000 * percentile(latencies, p) for p in (50, 90, 99)), 1000 * max(latencies)
+    ))
+    print('Throughput: {:.0f} results/sec, {:.1f} MB/sec'.format(results / total, characters / total / 1e6))
+    print()
+
+    params = Params(1994, 7)
+
+    print('Adversarial pages of {} characters:'.format(namespace.size))
+    for name, html in corpus.adversarial_pages(params, size=namespace.size):
+        print('  {:<16} {:.3f} ms'.format(name, 1000 * timed(html, params, namespace.repeat)))
+
+
+if __name__ == '__main__':
+    main()
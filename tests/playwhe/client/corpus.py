@@ -0,0 +1,106 @@
+import datetime
+import random
+
+from playwhe.common import Params, month_range
+from playwhe.constants import MAX_YEAR, START_DATE
+from playwhe.synthetic import generate
+
+
+RESULT_HTML = '<h2><strong> Draw #: </strong>{}<br><strong> Date: </strong>{:02d}-{}-{}<br><strong> Mark Drawn: </strong>{}{}<br><strong> Drawn at: </strong>{}<br></h2><br>'
+
+
+# From 2011 on some marks are followed by the promotion that was run with the
+# draw, which takes up most of the gap before the period
+PROMO_HTML = ' | <strong> Promo: </strong> {}'
+PROMOS = ['25:1()', '28:1(Red)', '30:1(Silver)', '32:1(Gold)', 'yes(white)', 'yes(red)', 'yes(green)']
+PROMO_YEAR = 2011
+
+
+FOOTER_HTML = '<!DOCTYPE html>\n<html lang="en">\n<head>\n\t<meta charset="utf-8">\n\t<title>Pick 4</title>\n</head>\n<body>\n</body>\n</html>\n'
+
+
+def render(rows, params, promos=None):
+    """Returns a page, in the format of the fixtures, for the given (draw, date, period, number) rows.
+
+    promos, if given, holds the promotion of each row, or None for a row without one.
+    """
+    promos = promos or [None] * len(rows)
+
+    return ''.join(
+        RESULT_HTML.format(draw, date.day, params.mmm, params.yy, number, '' if promo is None else PROMO_HTML.format(promo), period)
+        for (draw, date, period, number), promo in zip(rows, promos)
+    ) + FOOTER_HTML
+
+
+def month_pages(seed=0, today=None):
+    """Yields the (params, rows, html) of a synthetic page for every month from START_DATE up to today.
+
+    The pages from PROMO_YEAR on show promotions for most of their marks.
+    """
+    today = today or min(datetime.date.today(), datetime.date(MAX_YEAR, 12, 31))
+    draw = 1
+
+    for year, month in month_range((START_DATE.year, START_DATE.month), (today.year, today.month)):
+        next_month = datetime.date(year + month // 12, month % 12 + 1, 1)
+        start_date = max(datetime.date(year, month, 1), START_DATE)
+
+        rows = list(generate(
+            start_date=start_date,
+            end_date=next_month - datetime.timedelta(days=1),
+            seed='{}:{}-{}'.format(seed, year, month),
+            first_draw=draw
+        ))
+        draw += len(rows)
+
+        params = Params(year, month)
+        promos = None
+
+        if year >= PROMO_YEAR:
+            rng = random.Random('{}:{}-{}:promos'.format(seed, year, month))
+            promos = [rng.choice(PROMOS + [None]) for _ in rows]
+
+        yield params, rows, render(rows, params, promos)
+
+
+def malformed_pages(html, seed=0, count=50):
+    """Yields count copies of the page with random damage, like truncation, deletions and garbage."""
+    rng = random.Random(seed)
+
+    for _ in range(count):
+        page = html
+        damage = rng.choice(['truncate', 'delete', 'insert', 'swap', 'case'])
+
+        if damage == 'truncate':
+            page = page[:rng.randrange(len(page) + 1)]
+        elif damage == 'delete':
+            for _ in range(rng.randint(1, 20)):
+                i = rng.randrange(len(page) + 1)
+                page = page[:i] + page[i + rng.randint(1, 40):]
+        elif damage == 'insert':
+            for _ in range(rng.randint(1, 20)):
+                i = rng.randrange(len(page) + 1)
+                garbage = ''.join(chr(rng.randrange(32, 0x250)) for _ in range(rng.randint(1, 40)))
+                page = page[:i] + garbage + page[i:]
+        elif damage == 'swap':
+            i, j = sorted(rng.randrange(len(page) + 1) for _ in range(2))
+            page = page[j:] + page[i:j] + page[:i]
+        else:
+            page = page.swapcase()
+
+        yield damage, page
+
+
+def adversarial_pages(params, size=200000):
+    """Yields (name, html) pages of about size characters built to make a backtracking regex work hard."""
+    date = ' Date: </strong>04-{}-{}<br>'.format(params.mmm, params.yy)
+    mark = ' Mark Drawn: </strong>15<br>'
+
+    def repeat(unit):
+        return unit * (size // len(unit) + 1)
+
+    yield 'draws only', repeat('<strong> Draw #: </strong>1<br><strong>')
+    yield 'draws and dates', repeat('<strong> Draw #: </strong>1<br><strong>' + date)
+    yield 'no period', repeat('<strong> Draw #: </strong>1<br><strong>' + date + '<strong>' + mark)
+    yield 'long digits', '<strong> Draw #: </strong>' + '9' * size
+    yield 'one line', 'x' * size
+    yield 'whitespace', ' \n\t' * (size // 3)
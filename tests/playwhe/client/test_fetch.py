@@ -1,7 +1,7 @@
 import os
 import unittest
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from playwhe import client
 from playwhe.common import Params
@@ -20,6 +20,33 @@ class ScrapeFromMockServerTestCase(unittest.TestCase):
         self.assertEqual(len(results), 48)
         self.assertEqual(len(results.invalid), 0)
 
+    def test_it_skips_unchanged_pages(self):
+        params = Params(1994, 7)
+        post = Mock(name='post')
+        post.return_value = Mock(name='response', status_code=200, text=fake.response(params), headers={})
+        cache = client.PageCache()
+
+        results = client.fetch(params.year, params.month, post=post, cache=cache)
+        self.assertEqual(len(results), 48)
+
+        client.record_page(cache, params.year, params.month, results)
+
+        with patch('playwhe.client.parser.parse') as parse:
+            results = client.fetch(params.year, params.month, post=post, cache=cache)
+
+        self.assertEqual(results, [])
+        parse.assert_not_called()
+
+    def test_it_refetches_pages_that_were_not_recorded(self):
+        params = Params(1994, 7)
+        post = Mock(name='post')
+        post.return_value = Mock(name='response', status_code=200, text=fake.response(params), headers={})
+        cache = client.PageCache()
+
+        client.fetch(params.year, params.month, post=post, cache=cache)
+
+        self.assertEqual(len(client.fetch(params.year, params.month, post=post, cache=cache)), 48)
+
 
 @unittest.skipIf(os.environ.get('PLAYWHE_TESTS_USE_REAL_SERVER') is None, 'it connects to a real server')
 class ScrapeFromRealServerTestCase(unittest.TestCase):
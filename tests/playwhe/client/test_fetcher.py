@@ -1,11 +1,12 @@
 import os
+import tempfile
 import unittest
 
 from unittest.mock import Mock
 
 from requests import RequestException
 
-from playwhe.client.fetcher import fetch
+from playwhe.client.fetcher import PageCache, fetch, fetch_page
 from playwhe.common import Params
 from playwhe.errors import BadStatusCodeError, ServiceUnavailableError
 
@@ -37,6 +38,61 @@ class FetchFromMockServerTestCase(unittest.TestCase):
                     fetch(self.params, post=self.post)
 
 
+class ConditionalFetchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.params = Params(1994, 7)
+        self.post = Mock(name='post')
+        self.cache = PageCache()
+
+    def test_when_the_content_is_unchanged(self):
+        self.post.return_value = Mock(name='response', status_code=200, text='HTML', headers={})
+
+        page = fetch_page(self.params, post=self.post, cache=self.cache)
+        self.assertEqual(page.html, 'HTML')
+
+        # It's only skipped once it's recorded
+        self.assertEqual(fetch(self.params, post=self.post, cache=self.cache), 'HTML')
+
+        self.cache.record(self.params, page)
+        self.assertIsNone(fetch(self.params, post=self.post, cache=self.cache))
+
+        self.post.return_value = Mock(name='response', status_code=200, text='NEW HTML', headers={})
+
+        self.assertEqual(fetch(self.params, post=self.post, cache=self.cache), 'NEW HTML')
+
+    def test_when_the_server_says_it_is_unchanged(self):
+        self.post.return_value = Mock(name='response', status_code=200, text='HTML', headers={
+            'ETag': '"abc"',
+            'Last-Modified': 'Sat, 30 Jul 1994 19:00:00 GMT'
+        })
+
+        self.cache.record(self.params, fetch_page(self.params, post=self.post, cache=self.cache))
+
+        self.post.return_value = Mock(name='response', status_code=304)
+
+        self.assertIsNone(fetch(self.params, post=self.post, cache=self.cache))
+        self.assertEqual(self.post.call_args[1]['headers'], {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Sat, 30 Jul 1994 19:00:00 GMT'
+        })
+
+    def test_without_a_cache_304_is_a_bad_status_code(self):
+        self.post.return_value = Mock(name='response', status_code=304)
+
+        with self.assertRaises(BadStatusCodeError):
+            fetch(self.params, post=self.post)
+
+    def test_the_cache_can_be_saved(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'pages.json')
+
+            cache = PageCache(path)
+            cache.put(self.params, 'digest', etag='"abc"')
+            cache.save()
+
+            self.assertEqual(PageCache(path).get(self.params), { 'digest': 'digest', 'etag': '"abc"' })
+
+
 @unittest.skipIf(os.environ.get('PLAYWHE_TESTS_USE_REAL_SERVER') is None, 'it connects to a real server')
 class FetchFromRealServerTestCase(unittest.TestCase):
     def test_fetch(self):
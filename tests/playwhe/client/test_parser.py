@@ -36,3 +36,20 @@ class ParseTestCase(unittest.TestCase):
                 self.assertEqual(len(results), case['count'])
                 self.assertEqual(results[0], case['first'])
                 self.assertEqual(results[-1], case['last'])
+
+    def test_it_parses_after_a_draw(self):
+        params = Params(2015, 7)
+        html = fake.response(params)
+
+        cases = [
+            { 'after': 14115, 'draws': [14116, 14117] },
+            { 'after': 14117, 'draws': [] },
+            { 'after': 14017, 'draws': list(range(14018, 14118)) },
+            { 'after': 1, 'draws': list(range(14018, 14118)) }
+        ]
+
+        for case in cases:
+            results = parse(html, params, after=case['after'])
+
+            with self.subTest(after=case['after']):
+                self.assertEqual([r.draw for r in results], case['draws'])
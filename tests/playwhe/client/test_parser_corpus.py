@@ -0,0 +1,81 @@
+import datetime
+import time
+import unittest
+
+from playwhe.client.parser import parse
+from playwhe.common import Params, Result
+
+from . import corpus, fake
+
+
+class CorpusTestCase(unittest.TestCase):
+    def test_it_parses_every_month(self):
+        promos = 0
+
+        for params, rows, html in corpus.month_pages(today=datetime.date(2019, 3, 31)):
+            results = parse(html, params)
+            promos += html.count(' Promo: ')
+
+            with self.subTest(params=params):
+                self.assertEqual(len(results.invalid), 0)
+                self.assertEqual(
+                    [(r.draw, r.date, r.period, r.number) for r in results],
+                    rows
+                )
+
+        self.assertGreater(promos, 0)
+
+    def test_it_survives_malformed_pages(self):
+        for params in (Params(1994, 7), Params(2011, 11), Params(2015, 7)):
+            html = fake.response(params)
+            expected = parse(html, params)
+
+            for damage, page in corpus.malformed_pages(html, seed=params.year):
+                results = parse(page, params)
+
+                with self.subTest(params=params, damage=damage):
+                    for result in results:
+                        self.assertIsInstance(result, Result)
+
+                    if damage == 'truncate':
+                        self.assertEqual(list(results), expected[:len(results)])
+
+    def test_it_parses_the_longest_promos(self):
+        params = Params(2015, 7)
+        rows = [
+            (14020 + i, datetime.date(2015, 7, 1 + i // 4), period, 1 + i)
+            for i, period in enumerate(['EM', 'AM', 'AN', 'PM'] * 4)
+        ]
+        longest = max(corpus.PROMOS, key=len)
+
+        results = parse(corpus.render(rows, params, [longest] * len(rows)), params)
+
+        self.assertEqual([(r.draw, r.date, r.period, r.number) for r in results], rows)
+
+    def test_its_time_grows_linearly_on_adversarial_pages(self):
+        # With unbounded gaps a page that almost matches takes quadratic time,
+        # so a page 8 times as large would take about 64 times as long
+        params = Params(1994, 7)
+        small = dict(corpus.adversarial_pages(params, size=50000))
+        large = dict(corpus.adversarial_pages(params, size=400000))
+
+        def best_time(page):
+            times = []
+
+            for _ in range(3):
+                start = time.perf_counter()
+                parse(page, params)
+                times.append(time.perf_counter() - start)
+
+            return min(times)
+
+        for name in small:
+            with self.subTest(name=name):
+                self.assertLess(best_time(large[name]), 32 * max(best_time(small[name]), 1e-3))
+
+    def test_it_finds_nothing_on_adversarial_pages(self):
+        params = Params(1994, 7)
+
+        for name, page in corpus.adversarial_pages(params):
+            with self.subTest(name=name):
+                self.assertEqual(len(parse(page, params)), 0)
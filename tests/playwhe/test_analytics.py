@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+from playwhe.analytics import Analytics
+from playwhe.cli.store import Store, insert
+from playwhe.common import Result, Results
+from playwhe.history import History
+
+
+RESULTS = Results([
+    Result(1, 2015, 7, 6, 'EM', 1),
+    Result(2, 2015, 7, 6, 'AM', 2),
+    Result(3, 2015, 7, 6, 'AN', 2),
+    Result(4, 2015, 7, 6, 'PM', 3),
+    Result(5, 2015, 7, 7, 'EM', 1)
+])
+
+
+class AnalyticsTestCase(unittest.TestCase):
+    def test_transitions(self):
+        analytics = Analytics.from_history(History.from_results(RESULTS))
+
+        matrix = analytics.transition_matrix()
+        self.assertEqual(matrix[0][1], 1)
+        self.assertEqual(matrix[1][1], 1)
+        self.assertEqual(matrix[1][2], 1)
+        self.assertEqual(matrix[2][0], 1)
+        self.assertEqual(sum(map(sum, matrix)), 4)
+
+        self.assertEqual(analytics.transition_matrix('PM', 'EM')[2][0], 1)
+        self.assertEqual(sum(map(sum, analytics.transition_matrix('EM', 'AM'))), 1)
+
+    def test_cooccurrences(self):
+        matrix = Analytics.from_history(History.from_results(RESULTS)).cooccurrence_matrix()
+
+        self.assertEqual(matrix[0][1], 2)
+        self.assertEqual(matrix[1][0], 2)
+        self.assertEqual(matrix[1][1], 1)
+        self.assertEqual(matrix[1][2], 2)
+        self.assertEqual(matrix[0][2], 1)
+        self.assertEqual(sum(map(sum, matrix)), 11)
+
+    def test_incremental_update_matches_full_count(self):
+        full = Analytics.from_history(History.from_results(RESULTS))
+
+        for split in range(len(RESULTS)):
+            with self.subTest(split=split):
+                analytics = Analytics.from_history(History.from_results(RESULTS[:split]))
+                analytics.update(RESULTS)
+
+                self.assertEqual(analytics.transitions, full.transitions)
+                self.assertEqual(analytics.cooccurrences, full.cooccurrences)
+
+    def test_from_store_caches_to_disk(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, Results(RESULTS[:3]))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'analytics.json')
+
+            Analytics.from_store(store, path)
+            self.assertTrue(os.path.exists(path))
+
+            insert(store.bind, Results(RESULTS[3:]))
+            analytics = Analytics.from_store(store, path)
+
+        full = Analytics.from_history(History.from_results(RESULTS))
+
+        self.assertEqual(analytics.transitions, full.transitions)
+        self.assertEqual(analytics.cooccurrences, full.cooccurrences)
+
+    def test_from_store_counts_again_when_older_results_are_stored(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, Results(RESULTS[:2] + RESULTS[3:]))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'analytics.json')
+
+            Analytics.from_store(store, path)
+
+            # e.g. a missing draw that --repair found
+            insert(store.bind, Results(RESULTS[2:3]))
+            analytics = Analytics.from_store(store, path)
+
+        full = Analytics.from_history(History.from_results(RESULTS))
+
+        self.assertEqual(analytics.transitions, full.transitions)
+        self.assertEqual(analytics.cooccurrences, full.cooccurrences)
@@ -0,0 +1,69 @@
+import unittest
+
+from playwhe.backtest import \
+    GapLeaders, Numbers, RepeatPeriod, \
+    backtest, backtest_many, from_rule
+from playwhe.common import Result
+from playwhe.history import History
+
+
+HISTORY = History.from_results([
+    Result(1, 2015, 7, 6, 'EM', 1),
+    Result(2, 2015, 7, 6, 'AM', 2),
+    Result(3, 2015, 7, 6, 'AN', 3),
+    Result(4, 2015, 7, 6, 'PM', 4),
+    Result(5, 2015, 7, 7, 'EM', 1),
+    Result(6, 2015, 7, 7, 'AM', 5),
+    Result(7, 2015, 7, 7, 'AN', 3),
+    Result(8, 2015, 7, 7, 'PM', 6)
+])
+
+
+class BacktestTestCase(unittest.TestCase):
+    def test_numbers(self):
+        report = backtest(Numbers([1, 3]), HISTORY, odds=24)
+
+        total = report.total()
+        self.assertEqual(total.plays, 8)
+        self.assertEqual(total.staked, 16)
+        self.assertEqual(total.hits, 4)
+        self.assertEqual(total.payout, 96)
+        self.assertEqual(total.net(), 80)
+        self.assertEqual(total.hit_rate(), 0.5)
+
+        self.assertEqual(report.periods['EM'].hits, 2)
+        self.assertEqual(report.periods['AM'].hits, 0)
+
+    def test_repeat_period(self):
+        report = backtest(RepeatPeriod(periods=['EM', 'AN']), HISTORY)
+
+        self.assertEqual(report.periods['EM'].plays, 1)
+        self.assertEqual(report.periods['EM'].hits, 1)
+        self.assertEqual(report.periods['AN'].hits, 1)
+        self.assertEqual(report.periods['AM'].plays, 0)
+
+    def test_gap_leaders(self):
+        # Ties are broken by the smallest number, so mark 2 leads before draw 2
+        # and mark 5 leads before draw 6
+        report = backtest(GapLeaders(count=1, periods=['AM']), HISTORY)
+
+        self.assertEqual(report.periods['AM'].plays, 2)
+        self.assertEqual(report.periods['AM'].hits, 2)
+
+    def test_rules(self):
+        strategy = from_rule({ 'strategy': 'numbers', 'numbers': [1], 'periods': ['EM'] })
+
+        self.assertEqual(backtest(strategy, HISTORY).total().hits, 2)
+
+        with self.assertRaisesRegex(ValueError, "'strategy': 'unknown'"):
+            from_rule({ 'strategy': 'unknown' })
+
+    def test_backtest_many(self):
+        strategies = [
+            Numbers([1, 3]),
+            { 'strategy': 'repeat-period', 'periods': ['EM', 'AN'] }
+        ]
+
+        reports = backtest_many(strategies, HISTORY, workers=2)
+
+        self.assertEqual([r.total().hits for r in reports], [4, 2])
@@ -1,9 +1,16 @@
+import bz2
 import datetime
+import gzip
 import io
+import lzma
+import os
+import tempfile
 import unittest
 
-from playwhe.common import Params, Result, Results, Settings
-from playwhe.common import date_range, to_mmm, to_yy
+from playwhe.common import ErrorReport, Params, Result, Results, Settings
+from playwhe.common import MONTH_DRAWS
+from playwhe.common import open_csvfile, zstandard
+from playwhe.common import date_range, draws_on, get_params, month_range, periods_on, scheduled_draws, to_mmm, to_yy
 from playwhe.constants import MIN_YEAR, MAX_YEAR
 
 
@@ -69,6 +76,22 @@ class ParamsTestCase(unittest.TestCase):
                     Params(MIN_YEAR, invalid_month)
 
 
+class GetParamsTestCase(unittest.TestCase):
+    def test_it_returns_the_same_params(self):
+        params = get_params(1999, 1)
+
+        self.assertIs(get_params(1999, 1), params)
+        self.assertEqual(params.yy, '99')
+        self.assertEqual(params.mmm, 'Jan')
+
+    def test_when_invalid(self):
+        with self.assertRaisesRegex(ValueError, 'year={}'.format(MAX_YEAR+1)):
+            get_params(MAX_YEAR+1, 1)
+
+        with self.assertRaisesRegex(ValueError, 'month=13'):
+            get_params(MIN_YEAR, 13)
+
+
 class SettingsTestCase(unittest.TestCase):
     def test_defaults(self):
         settings = Settings()
@@ -250,6 +273,106 @@ class ResultsFromCSVFileTestCase(unittest.TestCase):
         )
 
 
+class ErrorReportTestCase(unittest.TestCase):
+    def test_it_keeps_a_bounded_number_of_samples(self):
+        lines = ['{},1994-07-04,AM,37'.format(i) for i in range(1, 1001)] + ['0,1994-07-04,XM,15']
+        report = ErrorReport(max_samples=2)
+        results = Results.from_csvfile(io.StringIO('\n'.join(lines)), error_report=report)
+
+        self.assertEqual(len(results), 0)
+        self.assertIs(results.error_report, report)
+        self.assertEqual(len(results.invalid), 2)
+        self.assertEqual(report.total, 1001)
+        self.assertEqual(report.counts, {
+            'number must be an integer between 1 and 36 inclusive': 1000,
+            'draw must be a positive integer': 1,
+            'period must be one of EM, AM, AN, PM': 1
+        })
+        self.assertFalse(results.all_valid())
+
+        self.assertEqual(results.full_error_messages(),
+            "Line 1: '1,1994-07-04,AM,37'\n"
+            "    number must be an integer between 1 and 36 inclusive: number='37'\n"
+            "Line 2: '2,1994-07-04,AM,37'\n"
+            "    number must be an integer between 1 and 36 inclusive: number='37'\n"
+            "... and 999 more invalid results\n"
+            "\n"
+            "Errors by type:\n"
+            "    draw must be a positive integer: 1\n"
+            "    number must be an integer between 1 and 36 inclusive: 1000\n"
+            "    period must be one of EM, AM, AN, PM: 1\n"
+            "\n"
+            "Total errors = 1001"
+        )
+
+    def test_it_writes_rejects(self):
+        reject_file = io.StringIO()
+        Results([Result(1, 1994, 7, 4, 'AM', 15), Result(0, 1994, 7, 4, 'AM', 15)], error_report=ErrorReport(reject_file=reject_file))
+        Results.from_csvfile(io.StringIO('1,1994-07-04,AM,15\nbat\n2,"1994-07-04, ""AM""",AM,15'), error_report=ErrorReport(reject_file=reject_file))
+
+        self.assertEqual(reject_file.getvalue(),
+            '"Result(draw=None, date=datetime.date(1994, 7, 4), period=\'AM\', number=15)"\n'
+            'bat\n'
+            '2,"1994-07-04, ""AM""",AM,15\n'
+        )
+
+    def test_update(self):
+        report = ErrorReport(max_samples=3)
+
+        for lines in ['bat\ncat', 'dog\nelk']:
+            report.update(Results.from_csvfile(io.StringIO(lines)).error_report)
+
+        self.assertEqual(report.total, 4)
+        self.assertEqual([r.line for r in report.samples], ['bat', 'cat', 'dog'])
+        self.assertEqual(report.counts['draw must be a positive integer'], 4)
+
+
+class OpenCSVFileTestCase(unittest.TestCase):
+    CONTENTS = '1,1994-07-04,AM,15\n2,1994-07-04,PM,11\n'
+
+    COMPRESSORS = [
+        ('plain', lambda data: data),
+        ('gzip', gzip.compress),
+        ('bz2', bz2.compress),
+        ('xz', lzma.compress)
+    ]
+
+    def test_when_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, compress in self.COMPRESSORS:
+                path = os.path.join(tmpdir, name)
+
+                with open(path, 'wb') as f:
+                    f.write(compress(self.CONTENTS.encode('utf-8')))
+
+                with self.subTest(compression=name):
+                    with open_csvfile(path) as csvfile:
+                        self.assertEqual(len(Results.from_csvfile(csvfile)), 2)
+
+    def test_when_binary_file(self):
+        for name, compress in self.COMPRESSORS:
+            binaryfile = io.BytesIO(compress(self.CONTENTS.encode('utf-8')))
+
+            with self.subTest(compression=name):
+                with open_csvfile(binaryfile) as csvfile:
+                    self.assertEqual(csvfile.read(), self.CONTENTS)
+
+                self.assertFalse(binaryfile.closed)
+
+    @unittest.skipIf(zstandard is None, 'the zstandard package is not installed')
+    def test_when_zstd(self):
+        binaryfile = io.BytesIO(zstandard.ZstdCompressor().compress(self.CONTENTS.encode('utf-8')))
+
+        with open_csvfile(binaryfile) as csvfile:
+            self.assertEqual(csvfile.read(), self.CONTENTS)
+
+    def test_when_text_file(self):
+        textfile = io.StringIO(self.CONTENTS)
+
+        with open_csvfile(textfile) as csvfile:
+            self.assertIs(csvfile, textfile)
+
+
 class DateRangeTestCase(unittest.TestCase):
     def test_when_there_is_no_start_date(self):
         output = list(date_range(today=lambda: datetime.date(1994, 10, 10)))
@@ -265,3 +388,49 @@ class DateRangeTestCase(unittest.TestCase):
         output = list(date_range(start_date=datetime.date(1996, 1, 31), period='PM', today=lambda: datetime.date(1996, 3, 1)))
 
         self.assertEqual(output, [(1996, 2), (1996, 3)])
+
+
+class MonthRangeTestCase(unittest.TestCase):
+    def test_it_crosses_years(self):
+        output = list(month_range((1999, 11), (2000, 2)))
+
+        self.assertEqual(output, [(1999, 11), (1999, 12), (2000, 1), (2000, 2)])
+
+    def test_when_start_is_after_end(self):
+        self.assertEqual(list(month_range((2000, 2), (2000, 1))), [])
+
+
+class PeriodsOnTestCase(unittest.TestCase):
+    def test_it_follows_the_eras(self):
+        cases = [
+            (datetime.date(1994, 7, 3), ()),
+            (datetime.date(1994, 7, 4), ('AM', 'PM')),
+            (datetime.date(2011, 11, 19), ('AM', 'PM')),
+            (datetime.date(2011, 11, 21), ('EM', 'AM', 'PM')),
+            (datetime.date(2015, 7, 4), ('EM', 'AM', 'PM')),
+            (datetime.date(2015, 7, 6), ('EM', 'AM', 'AN', 'PM')),
+            (datetime.date(2015, 7, 5), ()),
+            (datetime.date(MAX_YEAR + 1, 1, 1), ('EM', 'AM', 'AN', 'PM'))
+        ]
+
+        for date, periods in cases:
+            with self.subTest(date=date):
+                self.assertEqual(periods_on(date), periods)
+
+
+class ScheduledDrawsTestCase(unittest.TestCase):
+    def test_draws_on(self):
+        self.assertEqual(draws_on(datetime.date(1994, 7, 4)), 2)
+        self.assertEqual(draws_on(datetime.date(1994, 7, 10)), 0)
+
+    def test_it_counts_draws_across_eras(self):
+        # Sat 19th and Mon 21st of November 2011
+        self.assertEqual(scheduled_draws(datetime.date(2011, 11, 19), datetime.date(2011, 11, 21)), 5)
+
+    def test_it_ignores_dates_outside_the_calendar(self):
+        self.assertEqual(scheduled_draws(datetime.date(1990, 1, 1), datetime.date(1994, 7, 4)), 2)
+        self.assertEqual(scheduled_draws(datetime.date(1994, 7, 5), datetime.date(1994, 7, 4)), 0)
+
+    def test_month_draws(self):
+        self.assertEqual(MONTH_DRAWS[(1994, 7)], 48)
+        self.assertEqual(MONTH_DRAWS[(2015, 7)], 104)
@@ -0,0 +1,112 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine, inspect
+
+from playwhe.cli.store import Store
+from playwhe.common import Result
+from playwhe.games import GAMES, PLAY_WHE, Game, get_game, register, update_games
+
+
+PAGE = '''
+<strong>Draw #: </strong>7<br><strong> Date: </strong>04-Jul-94<br><strong> Ball: </strong>12<br><strong> Time: </strong>AM
+<strong>Draw #: </strong>8<br><strong> Date: </strong>04-Jul-94<br><strong> Ball: </strong>40<br><strong> Time: </strong>PM
+<strong>Draw #: </strong>9<br><strong> Date: </strong>05-Jul-94<br><strong> Ball: </strong>3<br><strong> Time: </strong>AM
+'''
+
+
+TOY = Game(
+    'toy', 1, 12, ('AM', 'PM'),
+    r'Draw #: </strong>(\d+).*? Date: </strong>(\d{1,2})-%s-%s.*? Ball: </strong>(\d+).*? Time: </strong>(AM|PM)',
+    'http://example.com/toy',
+    start_date=datetime.date(1994, 7, 1)
+)
+
+
+class GameTestCase(unittest.TestCase):
+    def test_play_whe_is_registered(self):
+        self.assertIs(get_game('playwhe'), PLAY_WHE)
+        self.assertIs(PLAY_WHE.result_class, Result)
+
+    def test_periods_on(self):
+        self.assertEqual(TOY.periods_on(datetime.date(1994, 6, 30)), ())
+        self.assertEqual(TOY.periods_on(datetime.date(1994, 7, 4)), ('AM', 'PM'))
+        self.assertEqual(TOY.periods_on(datetime.date(2015, 7, 6)), ('AM', 'PM'))
+        self.assertEqual(PLAY_WHE.periods_on(datetime.date(2015, 7, 6)), ('EM', 'AM', 'AN', 'PM'))
+
+    def test_unknown_games(self):
+        with self.assertRaises(ValueError):
+            get_game('unknown')
+
+    def test_register(self):
+        game = Game('another', 1, 10, ('PM',), '', 'http://example.com')
+
+        try:
+            self.assertIs(register(game), game)
+            self.assertIs(get_game('another'), game)
+
+            with self.assertRaises(ValueError):
+                register(game)
+        finally:
+            del GAMES['another']
+
+    def test_bad_periods(self):
+        with self.assertRaises(ValueError):
+            Game('bad', 1, 10, ('XX',), '', 'http://example.com')
+
+    def test_it_validates_with_its_own_range(self):
+        post = Mock(name='post', return_value=Mock(status_code=200, text=PAGE))
+
+        results = TOY.fetch(1994, 7, post=post)
+
+        self.assertEqual(post.call_args[0][0], 'http://example.com/toy')
+        self.assertEqual([r.draw for r in results], [7, 9])
+        self.assertEqual([r.draw for r in results.invalid], [8])
+        self.assertEqual(TOY.fetch(1994, 7, post=post, after=7)[0].number, 3)
+
+
+class UpdateGamesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.bind = create_engine('sqlite:///' + os.path.join(self.dirname.name, 'games.db'))
+
+        for game in (PLAY_WHE, TOY):
+            Store(self.bind, layout=game.layout()).initialize()
+
+    def tearDown(self):
+        self.bind.dispose()
+        self.dirname.cleanup()
+
+    def test_each_game_goes_into_its_own_tables(self):
+        play_whe_page = '<strong>Draw #: </strong>1<br><strong> Date: </strong>04-Jul-94<br><strong> Mark Drawn: </strong>15<br><strong> Drawn at: </strong>AM'
+
+        def post(url, **kwargs):
+            return Mock(status_code=200, text=PAGE if url == TOY.url else play_whe_page)
+
+        errors = update_games(self.bind, [PLAY_WHE, TOY], today=lambda: datetime.date(1994, 7, 31), post=post)
+
+        self.assertEqual(errors, {})
+        self.assertIn('toy_results', inspect(self.bind).get_table_names())
+
+        play_whe = Store(self.bind, layout=PLAY_WHE.layout())
+        toy = Store(self.bind, layout=TOY.layout())
+
+        self.assertEqual([r.draw for r in play_whe.results()], [1])
+        self.assertEqual([r.draw for r in toy.results()], [7, 9])
+        self.assertEqual([c.draw for c in toy.changes()], [7, 9])
+        self.assertEqual(toy.monthly_counts((1994, 7), (1994, 7), period='AM'), [
+            (1994, 7, 'AM', 3, 1),
+            (1994, 7, 'AM', 12, 1)
+        ])
+
+    def test_it_reports_the_games_that_failed(self):
+        def post(url, **kwargs):
+            return Mock(status_code=500 if url == TOY.url else 200, text='')
+
+        errors = update_games(self.bind, [PLAY_WHE, TOY], today=lambda: datetime.date(1994, 7, 31), post=post)
+
+        self.assertEqual(list(errors), ['toy'])
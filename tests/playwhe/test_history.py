@@ -0,0 +1,70 @@
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from playwhe.cli.layouts import ByYear
+from playwhe.cli.store import Store, insert
+from playwhe.common import Result, Results
+from playwhe.history import History
+
+
+RESULTS = Results([
+    Result(3, 1994, 7, 5, 'AM', 36),
+    Result(1, 1994, 7, 4, 'AM', 15),
+    Result(2, 1994, 7, 4, 'PM', 11),
+    Result(4, 1994, 7, 5, 'PM', 31)
+])
+
+
+class HistoryTestCase(unittest.TestCase):
+    def test_from_results_orders_by_date_period_and_draw(self):
+        history = History.from_results(RESULTS)
+
+        self.assertEqual(list(history.draws), [1, 2, 3, 4])
+        self.assertEqual(list(history.numbers), [15, 11, 36, 31])
+        self.assertEqual(list(history.periods), [1, 3, 1, 3])
+        self.assertEqual(history.result(0), Result(1, 1994, 7, 4, 'AM', 15))
+
+    def test_from_csvfile(self):
+        history = History.from_csvfile(io.StringIO('2,1994-07-04,PM,11\n1,1994-07-04,AM,15\nbad'))
+
+        self.assertEqual(list(history.draws), [1, 2])
+
+    def test_from_store(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, RESULTS)
+
+        history = History.from_store(store, start_date=datetime.date(1994, 7, 5))
+
+        self.assertEqual(list(history.draws), [3, 4])
+
+    def test_from_store_reads_the_tables_of_its_layout(self):
+        store = Store(layout=ByYear())
+        store.initialize()
+        insert(store.bind, Results(RESULTS + [Result(5, 1995, 1, 2, 'AM', 1)]), store.layout)
+
+        history = History.from_store(store)
+
+        self.assertEqual(list(history.draws), [1, 2, 3, 4, 5])
+
+    def test_extend_ignores_results_that_are_not_newer(self):
+        history = History.from_results(RESULTS[1:3])
+
+        appended = history.extend([Result(1, 1994, 7, 4, 'AM', 15), RESULTS[0], Result(0, 1994, 7, 5, 'PM', 1)])
+
+        self.assertEqual(appended, [RESULTS[0]])
+        self.assertEqual(list(history.draws), [1, 2, 3])
+
+    def test_save_and_load(self):
+        history = History.from_results(RESULTS)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'history.bin')
+            history.save(path)
+
+            loaded = History.load(path)
+
+        self.assertEqual(loaded.columns(), history.columns())
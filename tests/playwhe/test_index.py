@@ -0,0 +1,128 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from playwhe.cli.layouts import GameTables
+from playwhe.cli.store import Store, insert
+from playwhe.common import Result, Results
+from playwhe.history import History
+from playwhe.index import Index
+
+
+RESULTS = Results([
+    Result(1, 1994, 7, 4, 'AM', 14),
+    Result(2, 1994, 7, 4, 'PM', 14),
+    Result(3, 1994, 7, 5, 'AM', 36),
+    Result(4, 1994, 7, 7, 'PM', 14),
+    Result(5, 1994, 7, 8, 'AM', 1)
+])
+
+
+class IndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.index = Index.from_history(History.from_results(RESULTS))
+
+    def draws(self, results):
+        return [r.draw for r in results]
+
+    def test_from_store_reads_the_tables_of_its_layout(self):
+        store = Store(layout=GameTables('pick2'))
+        store.initialize()
+        insert(store.bind, RESULTS, store.layout)
+
+        index = Index.from_store(store)
+
+        self.assertEqual(self.draws(index.results(number=14)), [1, 2, 4])
+
+    def test_by_mark_and_period(self):
+        self.assertEqual(self.draws(self.index.results(number=14)), [1, 2, 4])
+        self.assertEqual(self.draws(self.index.results(number=14, period='PM')), [2, 4])
+        self.assertEqual(self.draws(self.index.results(period='AM')), [1, 3, 5])
+        self.assertEqual(self.draws(self.index.results(number=2)), [])
+
+    def test_by_date(self):
+        self.assertEqual(self.draws(self.index.on(datetime.date(1994, 7, 4))), [1, 2])
+        self.assertEqual(self.draws(self.index.on(datetime.date(1994, 7, 6))), [])
+        self.assertEqual(self.draws(self.index.on(datetime.date(1994, 7, 3))), [])
+        self.assertEqual(self.draws(self.index.on(datetime.date(1994, 7, 9))), [])
+        self.assertEqual(
+            self.draws(self.index.results(number=14, start_date=datetime.date(1994, 7, 5), end_date=datetime.date(1994, 7, 31))),
+            [4]
+        )
+
+    def test_by_draw(self):
+        self.assertEqual(self.draws(self.index.results(first=2, last=4)), [2, 3, 4])
+        self.assertEqual(self.draws(self.index.results(number=14, first=2)), [2, 4])
+
+    def test_extend(self):
+        index = Index.from_history(History.from_results(RESULTS[:2]))
+
+        appended = index.extend(RESULTS)
+
+        self.assertEqual(self.draws(appended), [3, 4, 5])
+        self.assertEqual(list(index.offsets), list(self.index.offsets))
+        self.assertEqual(list(index.marks[13]), list(self.index.marks[13]))
+        self.assertEqual(self.draws(index.on(datetime.date(1994, 7, 7))), [4])
+
+    def test_extend_with_an_older_result(self):
+        index = Index.from_history(History.from_results([RESULTS[0], RESULTS[1], RESULTS[3]]))
+
+        indexed = index.extend([RESULTS[2], RESULTS[4]])
+
+        self.assertEqual(self.draws(indexed), [3, 5])
+        self.assertEqual(list(index.offsets), list(self.index.offsets))
+        self.assertEqual(list(index.marks[13]), list(self.index.marks[13]))
+        self.assertEqual(self.draws(index.on(datetime.date(1994, 7, 5))), [3])
+        self.assertEqual(index.extend(RESULTS), [])
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'index.pwi')
+
+            self.index.save(path)
+            index = Index.load(path)
+
+        self.assertEqual(index.first_day, self.index.first_day)
+        self.assertEqual(self.draws(index.results(number=14, period='PM')), [2, 4])
+        self.assertEqual(self.draws(index.on(datetime.date(1994, 7, 5))), [3])
+
+    def test_from_store_extends_the_saved_index(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, Results(RESULTS[:2]), store.layout)
+
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'index.pwi')
+
+            Index.from_store(store, path)
+            insert(store.bind, Results(RESULTS[2:]), store.layout)
+            index = Index.from_store(store, path)
+
+            self.assertEqual(index.seq, store.last_seq())
+            self.assertEqual(Index.load(path).seq, store.last_seq())
+
+        self.assertEqual(self.draws(index.results(number=14)), [1, 2, 4])
+        self.assertEqual(list(index.offsets), list(self.index.offsets))
+
+    def test_from_store_rebuilds_when_older_results_were_stored(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, Results([RESULTS[0], RESULTS[1], RESULTS[3]]), store.layout)
+
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'index.pwi')
+
+            Index.from_store(store, path)
+            insert(store.bind, Results([RESULTS[2]]), store.layout)
+            index = Index.from_store(store, path)
+
+        self.assertEqual(self.draws(index.results()), [1, 2, 3, 4])
+        self.assertEqual(self.draws(index.on(datetime.date(1994, 7, 5))), [3])
+        self.assertEqual(list(index.marks[13]), [0, 1, 3])
+
+    def test_empty(self):
+        index = Index()
+
+        self.assertEqual(index.on(datetime.date(1994, 7, 4)), [])
+        self.assertEqual(index.results(number=14), [])
@@ -0,0 +1,85 @@
+import unittest
+
+from unittest.mock import patch
+
+from playwhe.common import Result
+from playwhe.errors import PlayWheError
+from playwhe.history import History
+from playwhe.pipeline import \
+    MarkSummary, SharedHistory, \
+    compare, default_jobs, run, run_job, run_serial
+
+
+HISTORY = History.from_results([
+    Result(1, 2015, 7, 6, 'EM', 1),
+    Result(2, 2015, 7, 6, 'AM', 2),
+    Result(3, 2015, 7, 6, 'AN', 1),
+    Result(4, 2015, 7, 6, 'PM', 4),
+    Result(5, 2015, 7, 7, 'EM', 5),
+    Result(6, 2015, 7, 7, 'AM', 1),
+    Result(7, 2015, 7, 7, 'AN', 3),
+    Result(8, 2015, 7, 7, 'PM', 6)
+])
+
+
+class SharedHistoryTestCase(unittest.TestCase):
+    def test_columns(self):
+        shared = SharedHistory(HISTORY)
+
+        self.assertEqual(len(shared), 8)
+        self.assertEqual([list(c) for c in shared.columns()], [list(c) for c in HISTORY.columns()])
+
+    def test_empty(self):
+        shared = SharedHistory(History())
+
+        self.assertEqual(len(shared), 0)
+        self.assertEqual([list(c) for c in shared.columns()], [[], [], [], []])
+
+
+class RunJobTestCase(unittest.TestCase):
+    def test_period(self):
+        statistics = run_job(HISTORY.columns(), ('period', 'AN'), trials=10)
+
+        self.assertEqual([s.name for s in statistics], ['chi-square', 'runs', 'serial-correlation', 'monte-carlo'])
+
+    def test_mark(self):
+        self.assertEqual(run_job(HISTORY.columns(), ('mark', 1)), MarkSummary(1, 3, 2.5, 3, 2))
+        self.assertEqual(run_job(HISTORY.columns(), ('mark', 6)), MarkSummary(6, 1, 0.0, 0, 0))
+        self.assertEqual(run_job(HISTORY.columns(), ('mark', 36)), MarkSummary(36, 0, 0.0, 0, 8))
+
+    def test_unknown_job(self):
+        with self.assertRaises(ValueError):
+            run_job(HISTORY.columns(), ('day', 1))
+
+
+class RunTestCase(unittest.TestCase):
+    def test_default_jobs(self):
+        jobs = default_jobs()
+
+        self.assertEqual(len(jobs), 4 + 36)
+        self.assertEqual(jobs[0], ('period', 'EM'))
+        self.assertEqual(jobs[-1], ('mark', 36))
+
+    def test_parallel_matches_serial(self):
+        serial = run_serial(HISTORY, trials=10)
+        parallel = run(HISTORY, workers=2, trials=10)
+
+        self.assertEqual(parallel, serial)
+        self.assertEqual(parallel[('mark', 1)], MarkSummary(1, 3, 2.5, 3, 2))
+
+    def test_compare(self):
+        results, timing = compare(HISTORY, [('period', 'EM'), ('mark', 1)], workers=2, trials=10)
+
+        self.assertEqual(set(results), { ('period', 'EM'), ('mark', 1) })
+        self.assertGreater(timing.serial, 0)
+        self.assertGreater(timing.parallel, 0)
+        self.assertAlmostEqual(timing.speedup, timing.serial / timing.parallel)
+
+    def test_compare_when_the_runs_disagree(self):
+        jobs = [('mark', 1), ('mark', 2)]
+        parallel = run_serial(HISTORY, jobs)
+        parallel[('mark', 2)] = None
+
+        with patch('playwhe.pipeline.run', return_value=parallel):
+            with self.assertRaisesRegex(PlayWheError, r"\('mark', 2\)"):
+                compare(HISTORY, jobs)
@@ -0,0 +1,46 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+from playwhe.profiling import Profiler, span
+
+
+class ProfilerTestCase(unittest.TestCase):
+    def test_spans_are_ignored_without_a_profiler(self):
+        with span('parse'):
+            pass
+
+    def test_it_records_the_spans(self):
+        with Profiler() as profiler:
+            for _ in range(3):
+                with span('parse'):
+                    sum(range(1000))
+
+            with span('insert'):
+                pass
+
+        self.assertEqual(list(profiler.spans), ['parse', 'insert'])
+        self.assertEqual(profiler.spans['parse'][0], 3)
+        self.assertEqual(profiler.spans['insert'][0], 1)
+
+        with span('parse'):
+            pass
+
+        self.assertEqual(profiler.spans['parse'][0], 3)
+
+    def test_it_writes_the_profile(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'update.prof')
+
+            with Profiler(path) as profiler:
+                with span('fetch'):
+                    sorted(range(1000), reverse=True)
+
+            pstats.Stats(path)
+
+        summary = profiler.summary()
+
+        self.assertIn('fetch', summary)
+        self.assertIn('total', summary)
+        self.assertIn('function calls', summary)
@@ -0,0 +1,91 @@
+import datetime
+import unittest
+
+from playwhe.cli.store import Store, insert
+from playwhe.common import Result, Results
+from playwhe.history import History
+from playwhe.rolling import RollingCounts
+
+
+RESULTS = Results([
+    Result(1, 2015, 7, 6, 'EM', 1),
+    Result(2, 2015, 7, 6, 'AM', 2),
+    Result(3, 2015, 7, 6, 'AN', 2),
+    Result(4, 2015, 7, 6, 'PM', 3),
+    Result(5, 2015, 7, 7, 'EM', 1),
+    Result(6, 2015, 7, 7, 'AM', 2)
+])
+
+
+def nonzero(counts):
+    return { number: count for number, count in counts.items() if count }
+
+
+class RollingCountsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rolling = RollingCounts(History.from_results(RESULTS))
+
+    def test_last_draws(self):
+        self.assertEqual(nonzero(self.rolling.last_draws(3)), { 1: 1, 2: 1, 3: 1 })
+        self.assertEqual(nonzero(self.rolling.last_draws(100)), { 1: 2, 2: 3, 3: 1 })
+        self.assertEqual(len(self.rolling.last_draws(3)), 36)
+
+    def test_last_draws_by_period(self):
+        self.assertEqual(nonzero(self.rolling.last_draws(1, 'EM')), { 1: 1 })
+        self.assertEqual(nonzero(self.rolling.last_draws(5, 'AM')), { 2: 2 })
+        self.assertEqual(nonzero(self.rolling.last_draws(5, 'AN')), { 2: 1 })
+
+    def test_last_days(self):
+        self.assertEqual(nonzero(self.rolling.last_days(1)), { 1: 1, 2: 1 })
+        self.assertEqual(nonzero(self.rolling.last_days(1, today=datetime.date(2015, 7, 6))), { 1: 1, 2: 2, 3: 1 })
+        self.assertEqual(nonzero(self.rolling.last_days(1, today=datetime.date(2015, 7, 8))), {})
+        self.assertEqual(nonzero(self.rolling.last_days(2, 'EM')), { 1: 2 })
+
+    def test_extend_matches_a_full_build(self):
+        rolling = RollingCounts(History.from_results(RESULTS[:2]))
+        rolling.extend(RESULTS)
+
+        self.assertEqual(len(rolling), len(RESULTS))
+        self.assertEqual(rolling.prefix, self.rolling.prefix)
+        self.assertEqual(rolling.period_prefix, self.rolling.period_prefix)
+
+    def test_extend_with_an_older_result(self):
+        rolling = RollingCounts(History.from_results([RESULTS[0], RESULTS[1], RESULTS[3]]))
+        counted = rolling.extend([RESULTS[2], RESULTS[4], RESULTS[5]])
+
+        self.assertEqual([r.draw for r in counted], [3, 5, 6])
+        self.assertEqual(list(rolling.history.draws), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(rolling.prefix, self.rolling.prefix)
+        self.assertEqual(rolling.period_prefix, self.rolling.period_prefix)
+        self.assertEqual(rolling.period_days, self.rolling.period_days)
+
+    def test_extend_ignores_results_already_counted(self):
+        rolling = RollingCounts(History.from_results(RESULTS))
+
+        self.assertEqual(rolling.extend(RESULTS[:3]), [])
+        self.assertEqual(rolling.prefix, self.rolling.prefix)
+
+    def test_it_follows_store_updates(self):
+        store = Store()
+        store.initialize()
+
+        rolling = RollingCounts()
+        store.subscribe(rolling.extend)
+
+        store.update(fetch=lambda year, month: Results(RESULTS), today=lambda: datetime.date(1994, 7, 4))
+
+        self.assertEqual(len(rolling), len(RESULTS))
+        self.assertEqual(rolling.prefix, self.rolling.prefix)
+
+    def test_it_follows_a_refetch_of_older_results(self):
+        store = Store()
+        store.initialize()
+        insert(store.bind, Results([RESULTS[0], RESULTS[1], RESULTS[3]]), store.layout)
+
+        rolling = RollingCounts(History.from_store(store))
+        store.subscribe(rolling.extend)
+
+        store.refetch([(2015, 7)], fetch=lambda year, month: Results(RESULTS))
+
+        self.assertEqual(len(rolling), len(RESULTS))
+        self.assertEqual(rolling.prefix, self.rolling.prefix)
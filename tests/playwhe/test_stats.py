@@ -0,0 +1,70 @@
+import unittest
+
+from playwhe import stats
+from playwhe.common import Result
+from playwhe.history import History
+
+
+UNIFORM = list(range(1, 37)) * 10
+
+
+class ChiSquareTestCase(unittest.TestCase):
+    def test_when_uniform(self):
+        statistic = stats.chi_square(UNIFORM)
+
+        self.assertEqual(statistic.value, 0)
+        self.assertAlmostEqual(statistic.p_value, 1)
+
+    def test_p_value(self):
+        # The reference values come from scipy.stats.chi2.sf
+        self.assertAlmostEqual(stats._chi_square_p_value(60, 35), 0.005343222370628376)
+        self.assertAlmostEqual(stats._chi_square_p_value(35, 35), 0.46820272447140193)
+        self.assertAlmostEqual(stats._chi_square_p_value(0.5, 1), 0.47950012218695337)
+
+
+class RunsTestCase(unittest.TestCase):
+    def test_when_alternating(self):
+        statistic = stats.runs_test([1, 36] * 50)
+
+        self.assertGreater(statistic.value, 0)
+        self.assertLess(statistic.p_value, 0.001)
+
+    def test_when_constant(self):
+        self.assertEqual(stats.runs_test([7] * 10).p_value, 1.0)
+
+
+class SerialCorrelationTestCase(unittest.TestCase):
+    def test_when_trending(self):
+        statistic = stats.serial_correlation(sorted(UNIFORM))
+
+        self.assertGreater(statistic.value, 0.9)
+        self.assertLess(statistic.p_value, 0.001)
+
+
+class MonteCarloTestCase(unittest.TestCase):
+    def test_it_is_deterministic(self):
+        numbers = [1] * 50 + UNIFORM
+
+        serial = stats.monte_carlo(numbers, trials=250, seed=7, workers=1)
+        parallel = stats.monte_carlo(numbers, trials=250, seed=7, workers=2)
+
+        self.assertEqual(serial, parallel)
+        self.assertLess(serial.p_value, 0.01)
+
+    def test_simulated_counts(self):
+        counts = stats._simulate_counts(stats.random.Random(0), 1000)
+
+        self.assertEqual(sorted(counts), list(range(1, 37)))
+        self.assertEqual(sum(counts.values()), 1000)
+
+
+class ReportTestCase(unittest.TestCase):
+    def test_it_reports_every_period(self):
+        history = History.from_results([
+            Result(i + 1, 2015, 7, 6 + i // 4, 'EM AM AN PM'.split()[i % 4], i % 36 + 1) for i in range(40)
+        ])
+
+        report = stats.report(history, trials=10, workers=1)
+
+        self.assertEqual(sorted(report, key=str), sorted([None, 'EM', 'AM', 'AN', 'PM'], key=str))
+        self.assertEqual([s.name for s in report[None]], ['chi-square', 'runs', 'serial-correlation', 'monte-carlo'])
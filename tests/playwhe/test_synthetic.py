@@ -0,0 +1,71 @@
+import datetime
+import io
+import os
+import tempfile
+import unittest
+
+from playwhe.cli.store import Store
+from playwhe.common import Results, periods_on
+from playwhe.history import History
+from playwhe.synthetic import generate, write_csv, write_history, write_store
+
+
+class GenerateTestCase(unittest.TestCase):
+    def test_it_follows_the_schedule(self):
+        rows = list(generate(end_date=datetime.date(2015, 7, 12), start_date=datetime.date(2015, 7, 1)))
+
+        days = {}
+        for _, date, period, _ in rows:
+            days.setdefault(date, []).append(period)
+
+        for date, periods in days.items():
+            with self.subTest(date=date):
+                self.assertEqual(tuple(periods), periods_on(date))
+
+        self.assertNotIn(datetime.date(2015, 7, 5), days)
+        self.assertEqual([row[0] for row in rows], list(range(1, len(rows) + 1)))
+
+    def test_it_stops_after_count(self):
+        self.assertEqual(len(list(generate(count=7))), 7)
+        self.assertEqual(list(generate(count=0)), [])
+
+    def test_it_is_reproducible(self):
+        self.assertEqual(list(generate(count=100, seed=1)), list(generate(count=100, seed=1)))
+        self.assertNotEqual(list(generate(count=100, seed=1)), list(generate(count=100, seed=2)))
+
+    def test_it_needs_a_bound(self):
+        with self.assertRaises(ValueError):
+            next(generate())
+
+
+class WriteTestCase(unittest.TestCase):
+    def test_write_csv(self):
+        f = io.StringIO()
+
+        self.assertEqual(write_csv(generate(count=50), f), 50)
+
+        f.seek(0)
+        results = Results.from_csvfile(f)
+
+        self.assertEqual(len(results), 50)
+        self.assertTrue(results.all_valid())
+
+    def test_write_history(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            path = os.path.join(dirname, 'synthetic.pwh')
+
+            self.assertEqual(write_history(generate(count=50), path, chunk_size=16), 50)
+
+            history = History.load(path)
+
+        rows = list(generate(count=50))
+
+        self.assertEqual(list(history.draws), [row[0] for row in rows])
+        self.assertEqual(list(history.numbers), [row[3] for row in rows])
+
+    def test_write_store(self):
+        store = Store()
+        store.initialize()
+
+        self.assertEqual(write_store(generate(count=50), store, batch_size=16), 50)
+        self.assertEqual(store.last_result().draw, 50)